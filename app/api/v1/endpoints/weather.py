@@ -1,18 +1,52 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.schemas.weather import WeatherAdviceRequest, WeatherAdviceResponse
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Tuple
+import asyncio
+import json
+import logging
+from app.schemas.weather import (
+    WeatherAdviceRequest,
+    WeatherAdviceResponse,
+    WeatherAdviceBatchRequest,
+    WeatherAdviceBatchItem,
+    WeatherAdviceBatchResponse,
+    AdviceUpgradeResponse
+)
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.services.weather_service import WeatherService
-from app.services.ai_service import AIService
+from app.services.ai_service import AIService, personalize_message, weather_signature
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.logging import stage_timer
+from app.core.metrics import metrics
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 weather_service = WeatherService()
 ai_service = AIService()
 
 
+class CachedUser(NamedTuple):
+    """조언 생성에 필요한 사용자 정보만 담은 캐시 항목"""
+    username: str
+    is_active: bool
+
+
+# 없는 사용자 id 음성 캐시 표시
+_USER_NOT_FOUND = object()
+
+# 사용자 id → CachedUser (조언 요청마다 DB 왕복을 하지 않도록)
+# 생성/수정시 이 워커의 항목은 바로 지우고, 다른 워커는 TTL이 지나면 반영됨
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE)
+metrics.register_collector("user_cache", user_cache.stats)
+
+
 @router.post("/advice", response_model=WeatherAdviceResponse)
 async def get_weather_advice(
     request: WeatherAdviceRequest,
@@ -25,33 +59,306 @@ async def get_weather_advice(
     - 사용자 확인용으로만 user_id 사용
     - 위치는 항상 Flutter에서 실시간으로 전송받음
     """
-    # 1. 사용자 존재 여부만 확인
-    result = await db.execute(select(User).where(User.id == request.user_id))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
-    
-    # 2. 요청에 포함된 실시간 위치 사용
-    lat = request.latitude
-    lon = request.longitude
-    
-    # 3. 기상청 API로 날씨 정보 가져오기
-    weather_data = await weather_service.get_weather_forecast(lat, lon)
+    # 1~3. 사용자 존재 여부 확인과 요청 위치의 기상청 예보 조회를 동시에 실행
+    user, weather_data = await _get_user_and_weather(db, request)
     
     # 4. GPT로 조언 생성 (message + checklist)
-    advice_data = await ai_service.generate_weather_advice(
-        weather_data=weather_data,
-        user_name=user.username
-    )
+    advice_id = None
+    if settings.ADVICE_HEDGE_ENABLED:
+        # GPT가 늦으면 규칙 기반 조언을 먼저 보내고, GPT 조언은 advice_id로 조회
+        advice_data, advice_id = await ai_service.generate_weather_advice_hedged(
+            weather_data=weather_data,
+            user_name=user.username
+        )
+    else:
+        advice_data = await ai_service.generate_weather_advice(
+            weather_data=weather_data,
+            user_name=user.username
+        )
     
     return WeatherAdviceResponse(
         message=advice_data["message"],
         checklist=advice_data["checklist"],
-        weather_info=weather_data
+        weather_info=weather_data,
+        advice_id=advice_id
+    )
+
+
+@router.post("/advice/batch", response_model=WeatherAdviceBatchResponse)
+async def get_weather_advice_batch(
+    request: WeatherAdviceBatchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    여러 사용자 날씨 조언 일괄 생성 (알림 서버용)
+    
+    - 항목 수(ADVICE_BATCH_MAX_ITEMS)는 요청 스키마에서 검증
+    - 사용자는 IN (...) 쿼리 한 번으로 확인 (캐시에 있는 사용자는 제외)
+    - 같은 격자의 사용자는 예보를 한 번만 조회
+    - 같은 날씨 시그니처의 격자는 조언을 한 번만 생성하고 이름만 붙임
+    - 실패한 항목은 status/error로 돌려주고 나머지는 계속 처리
+    - stream이면 완료되는 격자부터 NDJSON 한 줄씩 전송 (index로 요청 항목 구분)
+    """
+    users = await _get_users(db, {item.user_id for item in request.items})
+    results = _generate_batch_advice(request.items, users)
+    
+    if request.stream:
+        return StreamingResponse(
+            (result.model_dump_json() + "\n" async for result in results),
+            media_type="application/x-ndjson"
+        )
+    
+    collected = [result async for result in results]
+    collected.sort(key=lambda result: result.index)
+    return WeatherAdviceBatchResponse(results=collected)
+
+
+@router.get("/advice/{advice_id}", response_model=AdviceUpgradeResponse)
+async def get_upgraded_advice(advice_id: str):
+    """
+    지연 응답 모드에서 나중에 완성된 GPT 조언 조회
+    
+    /advice 응답에 advice_id가 있으면 이 엔드포인트로 GPT 조언을 받아 교체
+    (ADVICE_STORE_ENABLED이면 advice_id를 만든 워커가 아니어도 조회 가능)
+    """
+    upgrade = await ai_service.get_upgraded_advice(advice_id)
+    
+    if upgrade is None:
+        raise HTTPException(status_code=404, detail="조언을 찾을 수 없습니다")
+    
+    return AdviceUpgradeResponse(advice_id=advice_id, **upgrade)
+
+
+@router.post("/advice/stream")
+async def stream_weather_advice(
+    request: WeatherAdviceRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    날씨 조언 생성 (Server-Sent Events 스트리밍)
+    
+    /advice와 같은 요청을 받아 준비되는 대로 이벤트를 전송
+    - weather_info: 날씨 상세 정보 (예보 조회 직후)
+    - message: GPT 메시지 조각 (여러 번)
+    - checklist: 외출 준비 체크리스트
+    - done: 최종 message + checklist (클라이언트는 이 값을 최종 값으로 사용)
+    """
+    # 사용자 확인 중에 예보 조회를 먼저 시작 (사용자가 없으면 취소)
+    user, weather_task = await _start_user_and_weather(db, request)
+    
+    async def event_stream() -> AsyncIterator[str]:
+        weather_data = await weather_task
+        yield _sse_event("weather_info", weather_data)
+        
+        async for event, data in ai_service.stream_weather_advice(
+            weather_data=weather_data,
+            user_name=user.username
+        ):
+            yield _sse_event(event, data)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시(nginx) 버퍼링 방지
+        },
+        # 스트림이 시작되기 전에 클라이언트가 끊어도 응답 종료시 예보 조회 작업 정리
+        background=BackgroundTask(_cancel, weather_task)
     )
 
 
+def _sse_event(event: str, data: Any) -> str:
+    """SSE 이벤트 한 건 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _generate_batch_advice(
+    items: List[WeatherAdviceRequest],
+    users: Dict[int, CachedUser]
+) -> AsyncIterator[WeatherAdviceBatchItem]:
+    """
+    일괄 요청 항목별 결과를 완료되는 순서대로 생성
+    
+    격자별로 예보를 한 번 조회하고(ADVICE_BATCH_CONCURRENCY 동시 조회),
+    날씨 시그니처별로 이름 없는 조언을 한 번 생성해 공유
+    """
+    found = []
+    for index, item in enumerate(items):
+        if item.user_id in users:
+            found.append(index)
+        else:
+            yield WeatherAdviceBatchItem(
+                index=index,
+                user_id=item.user_id,
+                status=404,
+                error="사용자를 찾을 수 없습니다"
+            )
+    
+    groups = weather_service.group_by_grid(
+        [(items[index].latitude, items[index].longitude) for index in found]
+    )
+    semaphore = asyncio.Semaphore(settings.ADVICE_BATCH_CONCURRENCY)
+    advice_tasks: Dict[str, asyncio.Task] = {}
+    
+    async def resolve_cell(cell: Tuple[int, int], indexes: List[int]) -> List[WeatherAdviceBatchItem]:
+        try:
+            async with semaphore:
+                weather_data = await weather_service.get_grid_forecast(*cell)
+            
+            signature = weather_signature(weather_data)
+            if signature not in advice_tasks:
+                advice_tasks[signature] = asyncio.ensure_future(
+                    ai_service.generate_weather_advice(weather_data)
+                )
+            # 같은 시그니처를 기다리는 다른 격자가 있으므로 취소가 전파되지 않게 함
+            advice_data = await asyncio.shield(advice_tasks[signature])
+        except Exception as e:
+            logger.exception("일괄 조언 생성 실패 (격자 %s): %s", cell, e)
+            return [
+                WeatherAdviceBatchItem(
+                    index=index,
+                    user_id=items[index].user_id,
+                    status=500,
+                    error="조언 생성 중 오류가 발생했습니다"
+                )
+                for index in indexes
+            ]
+        
+        return [
+            WeatherAdviceBatchItem(
+                index=index,
+                user_id=items[index].user_id,
+                message=personalize_message(advice_data["message"], users[items[index].user_id].username),
+                checklist=list(advice_data["checklist"]),
+                weather_info=weather_data
+            )
+            for index in indexes
+        ]
+    
+    tasks = [
+        asyncio.ensure_future(resolve_cell(cell, [found[position] for position in positions]))
+        for cell, positions in groups.items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for result in await next_done:
+                yield result
+    finally:
+        # 스트리밍 중 클라이언트가 끊으면 남은 작업 정리
+        for task in [*tasks, *advice_tasks.values()]:
+            task.cancel()
+
+
+async def _get_users(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, CachedUser]:
+    """
+    여러 사용자 조회 (캐시 우선, 나머지는 IN 쿼리 한 번)
+    
+    Returns:
+        사용자 id → CachedUser (없거나 비활성인 사용자는 제외)
+    """
+    users: Dict[int, CachedUser] = {}
+    missing = []
+    for user_id in user_ids:
+        user = user_cache.get(user_id)
+        if user is None:
+            missing.append(user_id)
+        elif user is not _USER_NOT_FOUND and user.is_active:
+            users[user_id] = user
+    
+    if missing:
+        with stage_timer("user_query"):
+            result = await db.execute(
+                select(User.id, User.username, User.is_active).where(User.id.in_(missing))
+            )
+        found = set()
+        for row in result:
+            found.add(row.id)
+            user = CachedUser(row.username, row.is_active)
+            user_cache.set(row.id, user, settings.USER_CACHE_TTL_SECONDS)
+            if user.is_active:
+                users[row.id] = user
+        
+        for user_id in missing:
+            if user_id not in found:
+                user_cache.set(user_id, _USER_NOT_FOUND, settings.USER_CACHE_NEGATIVE_TTL_SECONDS)
+    
+    return users
+
+
+async def _get_user_and_weather(
+    db: AsyncSession,
+    request: WeatherAdviceRequest
+) -> Tuple[CachedUser, Dict[str, Any]]:
+    """
+    사용자 확인과 예보 조회를 동시에 실행
+    
+    사용자가 없으면(404) 예보 조회 작업을 취소하고 예외를 그대로 올림
+    (같은 격자를 기다리는 다른 요청의 공유 조회는 취소되지 않음)
+    """
+    user, weather_task = await _start_user_and_weather(db, request)
+    return user, await weather_task
+
+
+async def _start_user_and_weather(
+    db: AsyncSession,
+    request: WeatherAdviceRequest
+) -> Tuple[CachedUser, "asyncio.Task[Dict[str, Any]]"]:
+    """
+    예보 조회 작업을 시작하고 그동안 사용자 확인
+    
+    사용자가 없으면(404) 예보 조회 작업을 취소하고 예외를 그대로 올림.
+    반환한 작업은 호출한 쪽에서 기다리거나 취소해야 함
+    """
+    weather_task = _start_weather_fetch(request)
+    try:
+        user = await _get_user_or_404(db, request.user_id)
+    except BaseException:
+        await _cancel(weather_task)
+        raise
+    
+    return user, weather_task
+
+
+def _start_weather_fetch(request: WeatherAdviceRequest) -> "asyncio.Task[Dict[str, Any]]":
+    """요청 위치의 예보 조회를 별도 작업으로 시작"""
+    return asyncio.ensure_future(
+        weather_service.get_weather_forecast(request.latitude, request.longitude)
+    )
+
+
+async def _cancel(task: asyncio.Task):
+    """작업을 취소하고 종료까지 기다림 (결과/예외는 버림)"""
+    if task.done():
+        if not task.cancelled():
+            task.exception()  # 미확인 예외 경고 방지
+        return
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def _get_user_or_404(db: AsyncSession, user_id: int) -> CachedUser:
+    """사용자 조회 (캐시 우선, 없거나 비활성이면 404)"""
+    user = user_cache.get(user_id)
+    
+    if user is None:
+        with stage_timer("user_query"):
+            result = await db.execute(select(User).where(User.id == user_id))
+        db_user = result.scalar_one_or_none()
+        
+        if db_user:
+            user = CachedUser(db_user.username, db_user.is_active)
+            user_cache.set(user_id, user, settings.USER_CACHE_TTL_SECONDS)
+        else:
+            user = _USER_NOT_FOUND
+            user_cache.set(user_id, user, settings.USER_CACHE_NEGATIVE_TTL_SECONDS)
+    
+    if user is _USER_NOT_FOUND or not user.is_active:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
+    
+    return user
+
+
 @router.post("/users", response_model=UserResponse)
 async def create_user(
     user: UserCreate,
@@ -79,6 +386,9 @@ async def create_user(
     await db.commit()
     await db.refresh(db_user)
     
+    # 생성 전에 조회되어 음성 캐시된 id일 수 있으므로 제거
+    user_cache.pop(db_user.id)
+    
     return db_user
 
 
@@ -130,4 +440,6 @@ async def update_user(
     await db.commit()
     await db.refresh(user)
     
+    user_cache.pop(user_id)
+    
     return user
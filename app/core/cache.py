@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    프로세스 내 LRU 캐시 (항목별 만료 시각 지원)
+
+    - 최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - 항목마다 만료 시각(epoch 초)을 따로 지정할 수 있음
+    - asyncio 단일 스레드에서 사용하는 것을 전제로 하므로 락을 두지 않음
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize는 1 이상이어야 합니다")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > time.time()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 조회 (만료된 항목은 제거하고 miss 처리)"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """캐시 저장 (ttl: 지금부터 만료까지 남은 초)"""
+        if ttl <= 0:
+            return
+
+        self._data[key] = (value, time.time() + ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """항목 제거 후 값 반환"""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """hit/miss 통계"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / total) if total else None,
+        }
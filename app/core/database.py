@@ -1,17 +1,93 @@
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import metrics
 
 # SQLAlchemy Base
 Base = declarative_base()
 
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """커넥션 체크아웃 대기 시간/타임아웃을 메트릭으로 남기는 커넥션 풀"""
+    
+    checkout_wait = metrics.histogram("db_pool.checkout_wait_seconds")
+    timeouts = metrics.counter("db_pool.timeouts")
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts.inc()
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+
+def pool_stats(pool: AsyncAdaptedQueuePool) -> dict:
+    """풀 크기 대비 사용 중/오버플로 커넥션 수 (RDS 커넥션 한도 산정용)"""
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+
 # 비동기 엔진 생성
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
+    echo=settings.DB_ECHO,
+    future=True,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
 )
 
+# 풀 이벤트 메트릭 (체크아웃/체크인마다 풀 상태로 게이지 갱신)
+_connections_in_use = metrics.gauge("db_pool.in_use")
+_overflow = metrics.gauge("db_pool.overflow")
+_connects = metrics.counter("db_pool.connects")
+_invalidations = metrics.counter("db_pool.invalidations")
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    _connects.inc()
+
+
+def _update_pool_gauges():
+    stats = pool_stats(engine.pool)
+    _connections_in_use.set(stats["checked_out"])
+    _overflow.set(stats["overflow"])
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    _update_pool_gauges()
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    _update_pool_gauges()
+
+
+@event.listens_for(engine.sync_engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    _invalidations.inc()
+
+
+metrics.register_collector("db_pool", lambda: pool_stats(engine.pool))
+
 # 비동기 세션 팩토리
 AsyncSessionLocal = async_sessionmaker(
     engine,
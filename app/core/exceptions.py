@@ -3,7 +3,9 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Union
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class ErrorResponse:
@@ -106,11 +108,14 @@ async def general_exception_handler(request: Request, exc: Exception):
     """
     일반 예외 핸들러 (모든 예외의 폴백)
     """
-    # 로깅
-    print(f"Unhandled exception: {type(exc).__name__}")
-    print(f"Error: {str(exc)}")
-    if request.app.state.config.DEBUG:
-        traceback.print_exc()
+    # 로깅 (트레이스백 포함, 요청 ID는 로그 컨텍스트에서 붙음)
+    logger.error(
+        "Unhandled exception: %s: %s",
+        type(exc).__name__,
+        exc,
+        exc_info=exc,
+        extra={"method": request.method, "path": request.url.path}
+    )
     
     error_response = ErrorResponse(
         error_code="INTERNAL_ERROR",
@@ -141,6 +146,11 @@ class UserNotFoundError(Exception):
     pass
 
 
+class OverloadedError(Exception):
+    """동시 처리 한도 초과 (대기 예산 안에 처리 불가)"""
+    pass
+
+
 async def weather_api_exception_handler(request: Request, exc: WeatherAPIError):
     """기상청 API 에러 핸들러"""
     error_response = ErrorResponse(
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from app.core.exceptions import OverloadedError
+from app.core.metrics import metrics
+
+
+class ConcurrencyLimiter:
+    """
+    동시 실행 수 제한 + 대기 예산
+
+    - 동시에 limit개까지만 실행하고 나머지는 대기열에서 기다림
+    - 대기열이 max_queue 이상이거나 timeout 안에 차례가 오지 않으면
+      OverloadedError를 올려서 호출자가 바로 폴백하도록 함
+    - 대기열 길이, 실행 중 개수, 대기 시간, 거절 수를 메트릭으로 기록
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.active = 0
+
+        self._queue_depth = metrics.gauge(f"{name}.queue_depth")
+        self._in_flight = metrics.gauge(f"{name}.in_flight")
+        self._wait_seconds = metrics.histogram(f"{name}.queue_wait_seconds")
+        self._rejected = metrics.counter(f"{name}.rejected")
+
+    @asynccontextmanager
+    async def slot(self, timeout: float) -> AsyncIterator[None]:
+        """실행 슬롯 확보 (timeout: 대기 예산 초)"""
+        if self.waiting >= self.max_queue:
+            self._rejected.inc()
+            raise OverloadedError(f"대기열 초과 ({self.waiting}건 대기 중)")
+
+        started = time.perf_counter()
+        self.waiting += 1
+        self._queue_depth.set(self.waiting)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._rejected.inc()
+            raise OverloadedError(f"대기 예산 {timeout}초 초과")
+        finally:
+            self.waiting -= 1
+            self._queue_depth.set(self.waiting)
+            self._wait_seconds.observe(time.perf_counter() - started)
+
+        self.active += 1
+        self._in_flight.set(self.active)
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._in_flight.set(self.active)
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {"limit": self.limit, "waiting": self.waiting, "active": self.active}
@@ -0,0 +1,231 @@
+"""
+비동기 서버용 로깅 파이프라인
+
+- 요청 처리 코루틴은 QueueHandler로 레코드를 큐에 넣기만 하고, 실제 출력
+  (stdout 쓰기, JSON 직렬화)은 QueueListener 백그라운드 스레드에서 수행
+- 레코드에는 contextvars로 전달되는 요청 ID, 격자 좌표, 단계별 소요 시간을 붙임
+- 같은 위치에서 반복되는 경고/에러(기상청 장애 중 호출 실패 등)는 윈도우당
+  LOG_SAMPLE_BURST건만 기록하고, 생략한 건수는 다음 기록에 suppressed로 표시
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+# 요청 단위 컨텍스트 (asyncio 태스크로 복사되어 같은 요청의 하위 작업에도 전달됨)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+grid_cell_var: ContextVar[Optional[str]] = ContextVar("grid_cell", default=None)
+stage_timings_var: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_timings", default=None)
+
+# 하위 태스크에서 정한 값을 요청 자신의 컨텍스트(접근 로그 등)에서도 보도록
+# stage_timings_var처럼 요청마다 하나의 dict를 공유 (ContextVar.set은 태스크 안에만 반영됨)
+request_fields_var: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_fields", default=None)
+
+# LogRecord 기본 속성 (나머지는 extra로 넘긴 필드로 보고 JSON에 포함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def new_request_context(request_id: str) -> None:
+    """요청 시작시 요청 ID와 단계별 소요 시간 초기화"""
+    request_id_var.set(request_id)
+    grid_cell_var.set(None)
+    stage_timings_var.set({})
+    request_fields_var.set({})
+
+
+def set_grid_cell(cell: str) -> None:
+    """
+    현재 작업의 격자 좌표 설정
+
+    요청 단위 값은 처음 설정한 격자로 유지 (배치 요청의 격자별 작업은
+    각자의 grid_cell_var로 구분)
+    """
+    grid_cell_var.set(cell)
+    fields = request_fields_var.get()
+    if fields is not None:
+        fields.setdefault("grid_cell", cell)
+
+
+def record_timing(stage: str, seconds: float) -> None:
+    """현재 요청의 단계별 소요 시간(ms) 기록 (같은 단계는 누적)"""
+    timings = stage_timings_var.get()
+    if timings is not None:
+        timings[stage] = round(timings.get(stage, 0.0) + seconds * 1000, 1)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """with 블록의 소요 시간을 현재 요청의 단계별 소요 시간에 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(stage, time.perf_counter() - started)
+
+
+class ContextFilter(logging.Filter):
+    """레코드를 만든 코루틴의 요청 컨텍스트를 레코드에 복사 (큐에 넣기 전에 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.grid_cell = grid_cell_var.get()
+        if record.grid_cell is None:
+            fields = request_fields_var.get()
+            record.grid_cell = fields.get("grid_cell") if fields else None
+        timings = stage_timings_var.get()
+        record.timings = dict(timings) if timings else None
+        return True
+
+
+class ErrorSampler(logging.Filter):
+    """
+    같은 호출 위치(로거, 파일, 줄)의 WARNING 이상 레코드를 윈도우당 burst건만 통과
+
+    생략한 건수는 윈도우가 바뀐 뒤 처음 통과하는 레코드의 suppressed 필드로 남김
+    """
+
+    def __init__(self, window: float, burst: int):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._windows: Dict[Tuple[str, str, int], list] = {}  # 키 → [윈도우 시작, 통과 수, 생략 수]
+        self._suppressed = metrics.counter("logging.suppressed")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+
+            state[2] += 1
+        self._suppressed.inc()
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    메시지 인자 치환과 예외 트레이스백 문자열화만 호출 스레드에서 수행
+
+    (기본 QueueHandler는 메시지에 트레이스백을 이어 붙이므로 따로 보관)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """레코드를 한 줄 JSON으로 직렬화"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def setup_logging() -> None:
+    """
+    큐 기반 로깅 설정 (애플리케이션 시작시 한 번 호출, 중복 호출 무시)
+
+    - LOG_LEVEL: 루트 레벨, LOG_LEVELS: 모듈별 레벨 (예: {"app.openai.usage": "WARNING"})
+    - LOG_JSON이 False면 사람이 읽기 쉬운 한 줄 형식으로 출력
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(ErrorSampler(settings.LOG_SAMPLE_WINDOW_SECONDS, settings.LOG_SAMPLE_BURST))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    # uvicorn 로거도 같은 파이프라인으로 출력
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    큐에 남은 레코드를 모두 출력하고 백그라운드 스레드 종료
+
+    종료 뒤에 남는 로그가 버려지지 않도록 루트의 큐 핸들러를 출력 핸들러로
+    바꿔 달아서 이후 레코드는 호출 스레드에서 바로 출력한다.
+    """
+    global _listener
+    if _listener is None:
+        return
+
+    root = logging.getLogger()
+    queue_handlers = [h for h in root.handlers if isinstance(h, _QueueHandler)]
+    for handler in queue_handlers:
+        root.removeHandler(handler)
+
+    _listener.stop()
+    for output in _listener.handlers:
+        for handler in queue_handlers:
+            for log_filter in handler.filters:
+                output.addFilter(log_filter)
+        root.addHandler(output)
+    _listener = None
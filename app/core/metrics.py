@@ -0,0 +1,106 @@
+import bisect
+from typing import Any, Callable, Dict, Optional, Sequence
+
+
+# 지연 시간(초)용 기본 히스토그램 버킷
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """현재 값을 나타내는 게이지"""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (count, sum, 버킷별 개수)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": (self.sum / self.count) if self.count else None,
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 메트릭 저장소
+
+    - counter/gauge/histogram: 이름으로 만들거나 기존 것을 반환
+    - collector: 캐시 통계처럼 조회 시점에 계산하는 값을 등록
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._collectors: Dict[str, Callable[[], Any]] = {}
+
+    def counter(self, name: str) -> Counter:
+        if name not in self._counters:
+            self._counters[name] = Counter()
+        return self._counters[name]
+
+    def gauge(self, name: str) -> Gauge:
+        if name not in self._gauges:
+            self._gauges[name] = Gauge()
+        return self._gauges[name]
+
+    def histogram(self, name: str, buckets: Optional[Sequence[float]] = None) -> Histogram:
+        if name not in self._histograms:
+            self._histograms[name] = Histogram(buckets or DEFAULT_BUCKETS)
+        return self._histograms[name]
+
+    def register_collector(self, name: str, collector: Callable[[], Any]) -> None:
+        self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Any]:
+        """모든 메트릭의 현재 값"""
+        return {
+            "counters": {name: c.value for name, c in self._counters.items()},
+            "gauges": {name: g.value for name, g in self._gauges.items()},
+            "histograms": {name: h.snapshot() for name, h in self._histograms.items()},
+            "collectors": {name: collect() for name, collect in self._collectors.items()},
+        }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,51 @@
+import heapq
+import time
+from typing import Dict, Hashable, List
+
+
+class PopularityTracker:
+    """
+    감쇠 카운터 기반 인기 격자 추적기
+
+    forward decay 방식: 기록 시점이 늦을수록 큰 가중치를 더하므로
+    항목별로 감쇠를 갱신하지 않아도 순위가 반감기에 맞게 유지됨.
+    최대 크기를 넘으면 점수가 낮은 항목부터 정리해서 메모리를 제한함.
+    """
+
+    def __init__(self, maxsize: int = 5000, half_life: float = 21600.0):
+        self.maxsize = maxsize
+        self.half_life = half_life
+        self._scores: Dict[Hashable, float] = {}
+        self._landmark = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def record(self, key: Hashable) -> None:
+        """요청 한 건 기록"""
+        weight = self._weight(time.monotonic())
+        self._scores[key] = self._scores.get(key, 0.0) + weight
+
+        if len(self._scores) > self.maxsize:
+            self._prune()
+
+    def top(self, n: int) -> List[Hashable]:
+        """점수가 높은 순으로 상위 n개"""
+        return heapq.nlargest(n, self._scores, key=self._scores.__getitem__)
+
+    def _weight(self, now: float) -> float:
+        exponent = (now - self._landmark) / self.half_life
+        if exponent > 512:
+            # 가중치가 너무 커지기 전에 기준 시점을 옮기고 점수를 재조정
+            scale = 2.0 ** -exponent
+            self._scores = {k: v * scale for k, v in self._scores.items()}
+            self._landmark = now
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _prune(self) -> None:
+        keep = max(1, int(self.maxsize * 0.8))
+        self._scores = {
+            key: self._scores[key]
+            for key in heapq.nlargest(keep, self._scores, key=self._scores.__getitem__)
+        }
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 비동기 호출을 하나로 합치는 유틸리티
+
+    - 첫 호출자만 실제 작업을 실행하고, 나머지는 같은 결과(또는 예외)를 기다림
+    - 작업은 별도 Task로 실행되므로 기다리던 호출자 하나가 취소되어도
+      공유 작업은 취소되지 않음
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Future") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AdviceCache(Base):
+    """날씨 시그니처 + 예보 슬롯 단위 GPT 조언 (워커/서버 간 공유)"""
+    __tablename__ = "advice_cache"
+
+    # 예보 슬롯 (기상청 base_date, base_time) + 날씨 시그니처
+    signature = Column(String, primary_key=True)
+    base_date = Column(String(8), primary_key=True)
+    base_time = Column(String(4), primary_key=True)
+    
+    # 이름 없이 생성된 조언
+    message = Column(Text, nullable=False)
+    checklist = Column(JSON, nullable=False)
+    model = Column(String)
+    
+    # 메타 정보
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # 주기적 정리 기준
+
+    def __repr__(self):
+        return f"<AdviceCache(slot={self.base_date}{self.base_time}, signature={self.signature})>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AdviceUpgrade(Base):
+    """지연 응답 모드의 advice_id별 교체 조언 (어느 워커에서든 조회)"""
+    __tablename__ = "advice_upgrades"
+
+    advice_id = Column(String(32), primary_key=True)
+    
+    # pending: GPT 생성 중, ready: 완료 (message/checklist 채워짐)
+    status = Column(String(16), nullable=False)
+    message = Column(Text)
+    checklist = Column(JSON)
+    
+    # 메타 정보
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # 주기적 정리 기준
+
+    def __repr__(self):
+        return f"<AdviceUpgrade(advice_id={self.advice_id}, status={self.status})>"
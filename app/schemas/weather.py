@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
+from app.core.config import settings
 
 
 class WeatherAdviceRequest(BaseModel):
@@ -23,6 +24,7 @@ class WeatherAdviceResponse(BaseModel):
     message: str  # 친근한 날씨 멘트
     checklist: List[str]  # 외출 준비 체크리스트
     weather_info: dict  # 날씨 상세 정보
+    advice_id: Optional[str] = None  # 규칙 기반 조언을 먼저 보낸 경우 GPT 조언 조회용 ID
     
     class Config:
         json_schema_extra = {
@@ -46,6 +48,58 @@ class WeatherAdviceResponse(BaseModel):
         }
 
 
+class WeatherAdviceBatchRequest(BaseModel):
+    """여러 사용자 날씨 조언 일괄 요청 스키마"""
+    # 최대 항목 수는 스키마 검증 단계에서 거름 (초과시 나머지 항목은 검증하지 않음)
+    items: List[WeatherAdviceRequest] = Field(..., max_length=settings.ADVICE_BATCH_MAX_ITEMS)
+    stream: bool = False  # True면 완료되는 항목부터 NDJSON으로 전송
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"user_id": 1, "latitude": 37.5665, "longitude": 126.9780},
+                    {"user_id": 2, "latitude": 35.1796, "longitude": 129.0756}
+                ],
+                "stream": False
+            }
+        }
+
+
+class WeatherAdviceBatchItem(BaseModel):
+    """일괄 요청 항목별 결과 (실패한 항목은 error만 채움)"""
+    index: int  # 요청 items에서의 위치
+    user_id: int
+    status: int = 200  # 항목별 상태 코드 (404: 사용자 없음, 500: 처리 실패)
+    message: Optional[str] = None
+    checklist: Optional[List[str]] = None
+    weather_info: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class WeatherAdviceBatchResponse(BaseModel):
+    """여러 사용자 날씨 조언 일괄 응답 스키마 (요청 순서대로)"""
+    results: List[WeatherAdviceBatchItem]
+
+
+class AdviceUpgradeResponse(BaseModel):
+    """지연 응답 모드의 GPT 조언 조회 스키마"""
+    advice_id: str
+    status: str  # "pending": 생성 중, "ready": 완료
+    message: Optional[str] = None
+    checklist: Optional[List[str]] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "advice_id": "3f2b9c6e0d6a4f0f9a4c1b7e2d8a5c13",
+                "status": "ready",
+                "message": "오늘 엄청 춥대! 🥶 두꺼운 패딩 꼭 입고 나가.",
+                "checklist": ["두꺼운 패딩 입기", "목도리 착용", "장갑 챙기기"]
+            }
+        }
+
+
 class WeatherResponse(BaseModel):
     """날씨 응답 스키마 (기존 호환성 유지)"""
     city: str
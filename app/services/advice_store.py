@@ -0,0 +1,218 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models.advice_cache import AdviceCache
+from app.models.advice_upgrade import AdviceUpgrade
+
+logger = logging.getLogger(__name__)
+
+
+class AdviceStore:
+    """
+    PostgreSQL advice_cache 테이블 기반 공유 조언 저장소
+
+    프로세스 내 캐시는 재시작하면 사라지고 uvicorn 워커끼리 공유되지 않으므로,
+    GPT로 만든 조언을 (base_date, base_time, signature) 키로 저장해서 다른
+    워커/서버가 같은 조언을 다시 생성하지 않게 한다. 지연 응답 모드의 교체 조언도
+    advice_id 단위로 저장해서, 후속 조회가 다른 워커로 가도 찾을 수 있게 한다.
+
+    - get/put은 ADVICE_STORE_TIMEOUT_SECONDS 안에 끝나지 않거나 DB 오류가 나면
+      None/False를 반환 (호출자는 DB 없이 GPT 경로로 진행)
+    - 만료된 행은 start()로 시작하는 정리 작업이 주기적으로 삭제
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+        self._hits = metrics.counter("advice_store.hits")
+        self._misses = metrics.counter("advice_store.misses")
+        self._writes = metrics.counter("advice_store.writes")
+        self._errors = metrics.counter("advice_store.errors")
+        self._pruned = metrics.counter("advice_store.pruned")
+
+    def start(self) -> None:
+        """만료 조언 정리 작업 시작 (애플리케이션 시작시 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """정리 작업 종료 (애플리케이션 종료시 호출)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.ADVICE_STORE_PRUNE_INTERVAL_SECONDS)
+            try:
+                await self.prune()
+            except Exception as e:
+                logger.warning("만료 조언 정리 실패: %s", e)
+
+    async def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """
+        (base_date, base_time, signature)로 만료되지 않은 조언 조회
+
+        Returns:
+            {"message", "checklist"} 또는 None (없음/DB 오류/시간 초과)
+        """
+        base_date, base_time, signature = key
+        query = select(AdviceCache.message, AdviceCache.checklist).where(
+            AdviceCache.signature == signature,
+            AdviceCache.base_date == base_date,
+            AdviceCache.base_time == base_time,
+            AdviceCache.expires_at > func.now()
+        )
+
+        try:
+            row = (await self._execute(query)).first()
+        except Exception as e:
+            logger.warning("조언 저장소 조회 실패: %s", e)
+            self._errors.inc()
+            return None
+
+        if row is None:
+            self._misses.inc()
+            return None
+
+        self._hits.inc()
+        return {"message": row.message, "checklist": list(row.checklist)}
+
+    async def put(
+        self,
+        key: Tuple[str, str, str],
+        advice_data: Dict[str, Any],
+        ttl: float,
+        model: Optional[str] = None
+    ) -> bool:
+        """조언 저장 (같은 키가 있으면 덮어씀)"""
+        base_date, base_time, signature = key
+        values = {
+            "message": advice_data["message"],
+            "checklist": list(advice_data["checklist"]),
+            "model": model,
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl),
+        }
+        statement = insert(AdviceCache).values(
+            signature=signature,
+            base_date=base_date,
+            base_time=base_time,
+            **values
+        ).on_conflict_do_update(
+            index_elements=[AdviceCache.signature, AdviceCache.base_date, AdviceCache.base_time],
+            set_=values
+        )
+
+        try:
+            await self._execute(statement, commit=True)
+        except Exception as e:
+            logger.warning("조언 저장소 저장 실패: %s", e)
+            self._errors.inc()
+            return False
+
+        self._writes.inc()
+        return True
+
+    async def get_upgrade(self, advice_id: str) -> Optional[Dict[str, Any]]:
+        """
+        advice_id로 만료되지 않은 교체 조언 조회
+
+        Returns:
+            {"status": "pending"} 또는 {"status": "ready", "message", "checklist"},
+            None (없음/DB 오류/시간 초과)
+        """
+        query = select(
+            AdviceUpgrade.status, AdviceUpgrade.message, AdviceUpgrade.checklist
+        ).where(
+            AdviceUpgrade.advice_id == advice_id,
+            AdviceUpgrade.expires_at > func.now()
+        )
+
+        try:
+            row = (await self._execute(query)).first()
+        except Exception as e:
+            logger.warning("교체 조언 조회 실패: %s", e)
+            self._errors.inc()
+            return None
+
+        if row is None:
+            return None
+        if row.status != "ready":
+            return {"status": row.status}
+        return {"status": row.status, "message": row.message, "checklist": list(row.checklist)}
+
+    async def put_upgrade(self, advice_id: str, upgrade: Dict[str, Any], ttl: float) -> bool:
+        """교체 조언 상태 저장 (같은 advice_id가 있으면 덮어씀)"""
+        checklist = upgrade.get("checklist")
+        values = {
+            "status": upgrade["status"],
+            "message": upgrade.get("message"),
+            "checklist": None if checklist is None else list(checklist),
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl),
+        }
+        statement = insert(AdviceUpgrade).values(
+            advice_id=advice_id,
+            **values
+        ).on_conflict_do_update(
+            index_elements=[AdviceUpgrade.advice_id],
+            set_=values
+        )
+
+        try:
+            await self._execute(statement, commit=True)
+        except Exception as e:
+            logger.warning("교체 조언 저장 실패: %s", e)
+            self._errors.inc()
+            return False
+        return True
+
+    async def delete_upgrade(self, advice_id: str) -> bool:
+        """교체 조언 삭제 (GPT 생성이 실패/취소된 경우)"""
+        statement = delete(AdviceUpgrade).where(AdviceUpgrade.advice_id == advice_id)
+
+        try:
+            await self._execute(statement, commit=True)
+        except Exception as e:
+            logger.warning("교체 조언 삭제 실패: %s", e)
+            self._errors.inc()
+            return False
+        return True
+
+    async def prune(self) -> int:
+        """만료된 조언/교체 조언 삭제 후 삭제한 행 수 반환"""
+        pruned = 0
+        async with self._session_factory() as session:
+            for model in (AdviceCache, AdviceUpgrade):
+                result = await session.execute(
+                    delete(model).where(model.expires_at <= func.now())
+                )
+                pruned += result.rowcount
+            await session.commit()
+
+        self._pruned.inc(pruned)
+        return pruned
+
+    async def _execute(self, statement, commit: bool = False):
+        async def run():
+            async with self._session_factory() as session:
+                result = await session.execute(statement)
+                if commit:
+                    await session.commit()
+                return result
+
+        return await asyncio.wait_for(run(), timeout=settings.ADVICE_STORE_TIMEOUT_SECONDS)
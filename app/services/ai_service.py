@@ -1,35 +1,69 @@
 from openai import AsyncOpenAI
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple
+from datetime import datetime
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.exceptions import OverloadedError
+from app.core.limiter import ConcurrencyLimiter
+from app.core.logging import record_timing
+from app.core.metrics import metrics
+from app.core.singleflight import SingleFlight
+from app.services.advice_store import AdviceStore
+from app.services.weather_service import get_base_datetime, get_next_base_datetime
+import asyncio
 import json
+import logging
+import math
+import re
+import time
+import uuid
 
 
-class AIService:
-    """OpenAI GPT를 사용하여 날씨 기반 조언 생성"""
+logger = logging.getLogger(__name__)
+
+# OpenAI 호출마다 한 줄씩 남기는 사용량 로그 (필드는 extra로 전달)
+usage_logger = logging.getLogger("app.openai.usage")
+
+# 호출당 토큰 수 히스토그램 버킷
+TOKEN_BUCKETS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000)
+
+
+def _band(value: Optional[float], bounds: List[float]) -> Optional[int]:
+    """value가 속한 구간 번호 (bounds 경계 기준)"""
+    if value is None:
+        return None
+    for index, bound in enumerate(bounds):
+        if value < bound:
+            return index
+    return len(bounds)
+
+
+def weather_signature(weather_data: Dict[str, Any]) -> str:
+    """
+    조언 내용을 좌우하는 날씨 값만 양자화한 시그니처
     
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = "gpt-4o-mini"  # gpt-4o-mini 사용 (비용 효율적)
+    같은 시그니처의 날씨에는 같은 조언을 재사용함
+    - 기온: 3°C 구간
+    - 하늘 상태, 강수 형태: 그대로
+    - 강수확률: 10% 구간
+    - 습도/풍속: 프론트 표시 기준과 같은 구간
+    """
+    temperature = weather_data.get("temperature")
+    rain_probability = weather_data.get("rain_probability")
     
-    async def generate_weather_advice(
-        self, 
-        weather_data: Dict[str, Any],
-        user_name: str = "사용자"
-    ) -> Dict[str, Any]:
-        """
-        날씨 정보를 기반으로 친근한 조언과 체크리스트 생성
-        
-        Returns:
-            {
-                "message": "친근한 날씨 멘트",
-                "checklist": ["체크리스트 항목1", "체크리스트 항목2", ...]
-            }
-        """
-        # 날씨 정보를 텍스트로 변환
-        weather_summary = self._format_weather_info(weather_data)
-        
-        # GPT에게 전달할 프롬프트 (체크리스트 추가)
-        system_prompt = """당신은 친근하고 따뜻한 날씨 도우미입니다.
+    parts = [
+        None if temperature is None else math.floor(temperature / 3),
+        weather_data.get("sky_condition"),
+        weather_data.get("rain_type"),
+        None if rain_probability is None else rain_probability // 10,
+        _band(weather_data.get("humidity"), [30, 60, 80]),
+        _band(weather_data.get("wind_speed"), [1, 4, 9, 14]),
+    ]
+    return "|".join("-" if part is None else str(part) for part in parts)
+
+
+# GPT에게 전달할 시스템 프롬프트 (체크리스트 추가)
+SYSTEM_PROMPT = """당신은 친근하고 따뜻한 날씨 도우미입니다.
 아침에 외출하는 친구에게 카톡으로 날씨 조언을 보내듯이 말해주세요.
 
 응답은 반드시 다음 JSON 형식으로만 제공하세요:
@@ -66,23 +100,349 @@ checklist 작성 규칙:
   "checklist": ["가벼운 자켓 착용", "선글라스 챙기기", "물 한 병 준비", "편한 신발 신기"]
 }"""
 
-        user_prompt = f"""오늘의 날씨:
-{weather_summary}
+# 이름을 따로 받지 않았을 때의 기본 사용자 이름 (개인화하지 않음)
+DEFAULT_USER_NAME = "사용자"
+
+
+def personalize_message(message: str, user_name: str) -> str:
+    """
+    이름 없이 생성된 조언 메시지 앞에 사용자 호칭 추가
+    
+    반말 톤에 맞춰 받침이 있으면 "아", 없으면 "야"를 붙임 (예: 민준아, 철수야)
+    """
+    if not user_name or user_name == DEFAULT_USER_NAME:
+        return message
+    
+    last = user_name[-1]
+    if "가" <= last <= "힣":
+        has_final_consonant = (ord(last) - ord("가")) % 28 != 0
+        return f"{user_name}{'아' if has_final_consonant else '야'}, {message}"
+    return f"{user_name}, {message}"
+
+
+class MessageStreamExtractor:
+    """
+    스트리밍으로 들어오는 JSON 응답 조각에서 "message" 문자열 값만 뽑아내는 파서
+    
+    조각마다 feed()를 호출하면 새로 확정된 message 글자들을 돌려줌
+    (이스케이프 시퀀스가 조각 경계에서 잘려도 다음 조각에서 이어서 처리)
+    """
+    
+    _MESSAGE_START = re.compile(r'"message"\s*:\s*"')
+    
+    def __init__(self):
+        self._buffer = ""
+        self._start: Optional[int] = None
+        self._emitted = 0
+        self.done = False
+    
+    def feed(self, text: str) -> str:
+        self._buffer += text
+        if self.done:
+            return ""
+        
+        if self._start is None:
+            match = self._MESSAGE_START.search(self._buffer)
+            if match is None:
+                return ""
+            self._start = match.end()
+        
+        raw, closed = self._scan(self._buffer[self._start:])
+        self.done = closed
+        
+        decoded = json.loads(f'"{raw}"')
+        # 서로게이트 쌍의 앞쪽 절반만 들어온 경우 다음 조각까지 보류
+        if not closed and decoded and "\ud800" <= decoded[-1] <= "\udbff":
+            decoded = decoded[:-1]
+        
+        delta = decoded[self._emitted:]
+        self._emitted = len(decoded)
+        return delta
+    
+    def _scan(self, raw: str) -> Tuple[str, bool]:
+        """(디코딩 가능한 앞부분, 닫는 따옴표 발견 여부)"""
+        index = 0
+        while index < len(raw):
+            char = raw[index]
+            if char == '"':
+                return raw[:index], True
+            if char == "\\":
+                length = 6 if raw[index + 1:index + 2] == "u" else 2
+                if index + length > len(raw):
+                    return raw[:index], False
+                index += length
+                continue
+            index += 1
+        return raw, False
+
 
-{user_name}님에게 친근한 메시지와 외출 준비 체크리스트를 JSON 형식으로 생성해주세요."""
+class AIService:
+    """OpenAI GPT를 사용하여 날씨 기반 조언 생성"""
+    
+    def __init__(self):
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES
+        )
+        self.model = "gpt-4o-mini"  # gpt-4o-mini 사용 (비용 효율적)
+        
+        # 동시 GPT 호출 제한 (대기 예산을 넘기면 바로 규칙 기반 폴백)
+        self._limiter = ConcurrencyLimiter(
+            "openai",
+            limit=settings.OPENAI_MAX_CONCURRENCY,
+            max_queue=settings.OPENAI_MAX_QUEUE
+        )
+        self._requests = metrics.counter("openai.requests")
+        self._fallbacks = {
+            "overloaded": metrics.counter("openai.fallback.overloaded"),
+            "error": metrics.counter("openai.fallback.error"),
+        }
+        
+        # 호출별 토큰/지연 시간 집계 (max_tokens, 프롬프트, 모델 선택 튜닝용)
+        self._latency = metrics.histogram("openai.latency_seconds")
+        self._tokens = {
+            kind: metrics.counter(f"openai.tokens.{kind}")
+            for kind in ("prompt", "completion", "total")
+        }
+        self._token_histograms = {
+            kind: metrics.histogram(f"openai.{kind}_tokens", TOKEN_BUCKETS)
+            for kind in ("prompt", "completion")
+        }
+        self._truncated = metrics.counter("openai.truncated")  # max_tokens에 걸려 잘린 응답
+        # 스트리밍 호출은 응답에 usage가 없어(openai 1.3.7에는 stream_options 없음) 토큰 집계에서
+        # 빠지므로, openai.tokens.*는 일반 호출분만이고 빠진 호출 수는 따로 셈
+        self._stream_untracked = metrics.counter("openai.stream_usage_untracked")
+        metrics.register_collector("openai_limiter", self._limiter.stats)
+        metrics.register_collector("openai_fallback_rate", self._fallback_rate)
+        
+        # 날씨 시그니처 + 예보 슬롯 단위 조언 캐시 (GPT 호출 절감)
+        self._advice_cache = TTLCache(maxsize=settings.ADVICE_CACHE_SIZE)
+        metrics.register_collector("advice_cache", self._advice_cache.stats)
+        
+        # 응답과 별개로 계속 실행되는 작업 (GC로 사라지지 않도록 참조 유지)
+        self._background: Set[asyncio.Task] = set()
+        
+        # 워커/서버 간 공유 조언 저장소 (PostgreSQL, 설정으로 켬)
+        self.advice_store: Optional[AdviceStore] = (
+            AdviceStore() if settings.ADVICE_STORE_ENABLED else None
+        )
+        
+        # 시그니처별 마지막 GPT 조언 (슬롯이 바뀌어도 날씨가 같으면 재사용)
+        self._last_advice = TTLCache(maxsize=settings.ADVICE_CACHE_SIZE)
+        
+        self._pregenerated = metrics.counter("advice_pregen.generated")
+        self._carried_over = metrics.counter("advice_pregen.carried_over")
+        self._pregen_fallbacks = metrics.counter("advice_pregen.fallback")
+        self._pregen_seconds = metrics.histogram("advice_pregen.cycle_seconds")
+        
+        # 지연 응답 모드: advice_id → 백그라운드에서 완성된 GPT 조언
+        self._upgrades = TTLCache(maxsize=settings.ADVICE_CACHE_SIZE)
+        self._hedged = metrics.counter("advice_hedge.fallback_first")
+        
+        # 같은 프롬프트의 동시 GPT 요청 병합
+        self._inflight = SingleFlight()
+        metrics.register_collector("advice_inflight", self._inflight.stats)
+    
+    async def generate_weather_advice(
+        self, 
+        weather_data: Dict[str, Any],
+        user_name: str = DEFAULT_USER_NAME
+    ) -> Dict[str, Any]:
+        """
+        날씨 정보를 기반으로 친근한 조언과 체크리스트 생성
+        
+        GPT에는 이름 없이 요청해서 같은 날씨의 조언을 모든 사용자가 공유하고,
+        사용자 이름은 응답 메시지에 나중에 붙임
+        
+        Returns:
+            {
+                "message": "친근한 날씨 멘트",
+                "checklist": ["체크리스트 항목1", "체크리스트 항목2", ...]
+            }
+        """
+        advice_data, _ = await self._generate_shared_advice(weather_data)
+        return self._personalize(advice_data, user_name)
+    
+    async def _generate_shared_advice(self, weather_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        이름 없는 공유 조언 생성
+        
+        Returns:
+            (조언, 규칙 기반 폴백 여부)
+        """
+        # 같은 슬롯에 같은 날씨 시그니처로 만든 조언이 있으면 재사용
+        now = datetime.now()
+        cache_key = (*get_base_datetime(now), weather_signature(weather_data))
+        cached = self._advice_cache.get(cache_key)
+        if cached is not None:
+            self._record_usage("advice", cache="hit")
+            return cached, False
+        
+        # 같은 프롬프트로 동시에 들어온 요청은 저장소 조회/GPT 호출 한 번을 공유
+        user_prompt = self._build_user_prompt(weather_data)
+        return await self._inflight.do(
+            self._prompt_key(user_prompt),
+            lambda: self._load_or_request_advice(user_prompt, weather_data, cache_key, now)
+        )
+    
+    async def generate_weather_advice_hedged(
+        self,
+        weather_data: Dict[str, Any],
+        user_name: str = DEFAULT_USER_NAME,
+        budget_ms: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        지연 예산 안에 GPT 조언이 오지 않으면 규칙 기반 조언을 먼저 반환
+        
+        GPT 호출은 백그라운드에서 계속 진행되고, 완성된 조언은 반환한
+        advice_id로 get_upgraded_advice()에서 조회할 수 있음
+        (공유 저장소가 있으면 다른 워커에서도 조회 가능).
+        이어진 GPT 호출도 실패해서 폴백이 되면 advice_id를 지움 (조회시 404)
+        
+        Returns:
+            (조언, advice_id 또는 None) - 예산 안에 GPT 조언을 받으면 advice_id는 None
+        """
+        if budget_ms is None:
+            budget_ms = settings.ADVICE_HEDGE_BUDGET_MS
+        
+        task = asyncio.ensure_future(self._generate_shared_advice(weather_data))
+        done, _ = await asyncio.wait({task}, timeout=budget_ms / 1000)
+        if task in done:
+            advice_data, _ = task.result()
+            return self._personalize(advice_data, user_name), None
+        
+        advice_id = uuid.uuid4().hex
+        self._upgrades.set(advice_id, {"status": "pending"}, settings.ADVICE_UPGRADE_TTL_SECONDS)
+        self._hedged.inc()
+        
+        self._background.add(task)
+        task.add_done_callback(lambda t: self._store_upgrade(advice_id, t, user_name))
+        
+        if self.advice_store is not None:
+            shared = asyncio.ensure_future(self._share_upgrade(advice_id, task, user_name))
+            self._background.add(shared)
+            shared.add_done_callback(self._background.discard)
+        
+        fallback = self._generate_fallback_advice(weather_data)
+        return self._personalize(fallback, user_name), advice_id
+    
+    async def get_upgraded_advice(self, advice_id: str) -> Optional[Dict[str, Any]]:
+        """
+        지연 응답 모드에서 백그라운드로 완성된 조언 조회
+        
+        이 워커가 만든 advice_id가 아니면 공유 저장소에서 조회
+        
+        Returns:
+            {"status": "pending"} 또는 {"status": "ready", "message", "checklist"},
+            모르는(만료된) advice_id면 None
+        """
+        upgrade = self._upgrades.get(advice_id)
+        if upgrade is None and self.advice_store is not None:
+            upgrade = await self.advice_store.get_upgrade(advice_id)
+        return upgrade
+    
+    def _store_upgrade(self, advice_id: str, task: "asyncio.Task", user_name: str):
+        self._background.discard(task)
+        upgrade = self._finished_upgrade(task, user_name)
+        if upgrade is None:
+            self._upgrades.pop(advice_id)
+            return
+        self._upgrades.set(advice_id, upgrade, settings.ADVICE_UPGRADE_TTL_SECONDS)
+    
+    async def _share_upgrade(self, advice_id: str, task: "asyncio.Task", user_name: str):
+        """교체 조언 상태를 공유 저장소에 기록 (pending → ready, 실패/폴백시 삭제)"""
+        ttl = settings.ADVICE_UPGRADE_TTL_SECONDS
+        await self.advice_store.put_upgrade(advice_id, {"status": "pending"}, ttl)
+        
+        await asyncio.wait({task})
+        upgrade = self._finished_upgrade(task, user_name)
+        if upgrade is None:
+            await self.advice_store.delete_upgrade(advice_id)
+            return
+        await self.advice_store.put_upgrade(advice_id, upgrade, ttl)
+    
+    def _finished_upgrade(self, task: "asyncio.Task", user_name: str) -> Optional[Dict[str, Any]]:
+        """완료된 GPT 작업의 교체 조언 (취소/실패했거나 폴백이면 None, 이미 보낸 폴백을 다시 보내지 않음)"""
+        if task.cancelled() or task.exception() is not None:
+            return None
+        advice_data, fallback = task.result()
+        if fallback:
+            return None
+        return {"status": "ready", **self._personalize(advice_data, user_name)}
+    
+    def _build_user_prompt(self, weather_data: Dict[str, Any]) -> str:
+        """GPT에게 전달할 사용자 프롬프트 (이름 없이 날씨만)"""
+        # 날씨 정보를 텍스트로 변환
+        weather_summary = self._format_weather_info(weather_data)
+        
+        return f"""오늘의 날씨:
+{weather_summary}
 
+친근한 메시지(이름/호칭 없이)와 외출 준비 체크리스트를 JSON 형식으로 생성해주세요."""
+    
+    def _prompt_key(self, user_prompt: str) -> str:
+        """동시 요청 병합용 프롬프트 키 (공백 차이 무시)"""
+        return f"{self.model}:{' '.join(user_prompt.split())}"
+    
+    async def _load_or_request_advice(
+        self,
+        user_prompt: str,
+        weather_data: Dict[str, Any],
+        cache_key: tuple,
+        now: datetime
+    ) -> Tuple[Dict[str, Any], bool]:
+        """공유 저장소에 다른 워커가 만든 조언이 있으면 사용하고, 없으면 GPT 호출"""
+        stored = await self._load_stored_advice(cache_key, now)
+        if stored is not None:
+            self._record_usage("advice", cache="store")
+            return stored, False
+        return await self._request_advice(user_prompt, weather_data, cache_key, now)
+    
+    async def _load_stored_advice(self, cache_key: tuple, now: datetime) -> Optional[Dict[str, Any]]:
+        """공유 저장소 조회 후 프로세스 내 캐시에 채움 (저장소가 없거나 실패하면 None)"""
+        if self.advice_store is None:
+            return None
+        
+        advice_data = await self.advice_store.get(cache_key)
+        if advice_data is not None:
+            self._store_advice(cache_key, advice_data, now, persist=False)
+        return advice_data
+    
+    async def _request_advice(
+        self,
+        user_prompt: str,
+        weather_data: Dict[str, Any],
+        cache_key: tuple,
+        now: datetime
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        GPT 호출 후 조언 캐시에 저장 (실패시 규칙 기반 폴백)
+        
+        같은 프롬프트를 기다리는 모든 요청이 이 결과(또는 폴백)를 공유함
+        
+        Returns:
+            (조언, 폴백 여부) - 폴백 여부는 openai.fallback.* 메트릭과 같은 기준
+        """
+        self._requests.inc()
+        started = time.perf_counter()
+        usage = finish_reason = None
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300,
-                response_format={"type": "json_object"}  # JSON 응답 강제
-            )
+            async with self._limiter.slot(settings.OPENAI_QUEUE_TIMEOUT_SECONDS):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=300,
+                    response_format={"type": "json_object"}  # JSON 응답 강제
+                )
             
+            usage = getattr(response, "usage", None)
+            finish_reason = response.choices[0].finish_reason
             advice_json = response.choices[0].message.content.strip()
             advice_data = json.loads(advice_json)
             
@@ -90,12 +450,302 @@ checklist 작성 규칙:
             if "message" not in advice_data or "checklist" not in advice_data:
                 raise ValueError("Invalid response format")
             
-            return advice_data
+            # GPT 응답만 캐시 (폴백 조언은 다음 요청에서 다시 GPT 시도)
+            self._store_advice(cache_key, advice_data, now)
+            self._record_usage("advice", started=started, usage=usage, finish_reason=finish_reason)
+            
+            return advice_data, False
+            
+        except OverloadedError as e:
+            logger.warning("OpenAI 대기열 초과로 폴백: %s", e)
+            self._fallbacks["overloaded"].inc()
+            self._record_usage("advice", started=started, fallback="overloaded")
+            return self._generate_fallback_advice(weather_data), True
+        except Exception as e:
+            logger.warning("OpenAI API 호출 실패: %s", e)
+            self._fallbacks["error"].inc()
+            # 응답은 받았지만 형식이 잘못된 경우에도 사용한 토큰은 집계
+            self._record_usage(
+                "advice", started=started, usage=usage, finish_reason=finish_reason, fallback="error"
+            )
+            # 폴백: 간단한 규칙 기반 조언
+            return self._generate_fallback_advice(weather_data), True
+    
+    async def stream_weather_advice(
+        self,
+        weather_data: Dict[str, Any],
+        user_name: str = DEFAULT_USER_NAME
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        GPT 스트리밍 API로 조언을 생성하면서 조각 단위로 전달
+        
+        Yields:
+            ("message", 메시지 조각) - 여러 번
+            ("checklist", 체크리스트)
+            ("done", {"message": 전체 메시지, "checklist": 체크리스트})
+        
+        중간에 실패하면 done 이벤트에 규칙 기반 폴백 조언을 담아 보냄
+        (클라이언트는 done의 message를 최종 값으로 사용)
+        """
+        now = datetime.now()
+        cache_key = (*get_base_datetime(now), weather_signature(weather_data))
+        cached = self._advice_cache.get(cache_key)
+        if cached is not None:
+            self._record_usage("stream", cache="hit")
+        else:
+            cached = await self._load_stored_advice(cache_key, now)
+            if cached is not None:
+                self._record_usage("stream", cache="store")
+        if cached is not None:
+            advice = self._personalize(cached, user_name)
+            yield "message", advice["message"]
+            yield "checklist", advice["checklist"]
+            yield "done", advice
+            return
+        
+        # 이름 호칭은 GPT 응답을 기다리지 않고 먼저 전송
+        prefix = personalize_message("", user_name)
+        if prefix:
+            yield "message", prefix
+        
+        self._requests.inc()
+        started = time.perf_counter()
+        finish_reason = None
+        # 리미터 슬롯은 GPT 스트림을 읽는 작업만 잡고, 클라이언트 전송 속도와 무관하게 반납
+        chunk_queue: "asyncio.Queue[Optional[Tuple[str, Optional[str]]]]" = asyncio.Queue()
+        reader = asyncio.ensure_future(
+            self._read_advice_stream(self._build_user_prompt(weather_data), chunk_queue)
+        )
+        try:
+            extractor = MessageStreamExtractor()
+            chunks = []
+            while True:
+                item = await chunk_queue.get()
+                if item is None:
+                    break
+                content, chunk_finish_reason = item
+                finish_reason = chunk_finish_reason or finish_reason
+                chunks.append(content)
+                delta = extractor.feed(content)
+                if delta:
+                    yield "message", delta
+            await reader  # 스트림 읽기 실패(대기열 초과 포함)는 여기서 올림
+            
+            advice_data = json.loads("".join(chunks))
+            
+            # 응답 검증
+            if "message" not in advice_data or "checklist" not in advice_data:
+                raise ValueError("Invalid response format")
+            
+            self._store_advice(cache_key, advice_data, now)
+            # 스트리밍 응답에는 usage가 없어 토큰 수는 집계하지 않음 (openai.stream_usage_untracked)
+            self._record_usage("stream", started=started, finish_reason=finish_reason)
             
+        except OverloadedError as e:
+            logger.warning("OpenAI 대기열 초과로 폴백: %s", e)
+            self._fallbacks["overloaded"].inc()
+            self._record_usage("stream", started=started, fallback="overloaded")
+            advice_data = self._generate_fallback_advice(weather_data)
         except Exception as e:
-            print(f"OpenAI API 호출 실패: {e}")
+            logger.warning("OpenAI 스트리밍 호출 실패: %s", e)
+            self._fallbacks["error"].inc()
+            self._record_usage("stream", started=started, finish_reason=finish_reason, fallback="error")
             # 폴백: 간단한 규칙 기반 조언
-            return self._generate_fallback_advice(weather_data)
+            advice_data = self._generate_fallback_advice(weather_data)
+        finally:
+            # 클라이언트가 먼저 끊으면 GPT 스트림 읽기도 중단하고 슬롯 반납
+            if not reader.done():
+                reader.cancel()
+            elif not reader.cancelled():
+                reader.exception()  # 미확인 예외 경고 방지
+        
+        advice = self._personalize(advice_data, user_name)
+        yield "checklist", advice["checklist"]
+        yield "done", advice
+    
+    async def _read_advice_stream(
+        self,
+        user_prompt: str,
+        chunk_queue: "asyncio.Queue[Optional[Tuple[str, Optional[str]]]]"
+    ):
+        """
+        리미터 슬롯을 잡고 GPT 스트림을 끝까지 읽어 (조각, finish_reason)을 큐에 넣음
+        
+        성공/실패와 관계없이 마지막에 None을 넣어 끝을 알림
+        """
+        try:
+            async with self._limiter.slot(settings.OPENAI_QUEUE_TIMEOUT_SECONDS):
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=300,
+                    response_format={"type": "json_object"},  # JSON 응답 강제
+                    stream=True
+                )
+                self._stream_untracked.inc()
+                
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    chunk_queue.put_nowait(
+                        (chunk.choices[0].delta.content or "", chunk.choices[0].finish_reason)
+                    )
+        finally:
+            chunk_queue.put_nowait(None)
+    
+    def _store_advice(
+        self,
+        cache_key: tuple,
+        advice_data: Dict[str, Any],
+        now: datetime,
+        persist: bool = True
+    ):
+        """
+        다음 예보 발표 시각(최대 ADVICE_CACHE_TTL_SECONDS)까지 조언 캐시
+        
+        persist이면 공유 저장소에도 백그라운드로 저장 (응답을 기다리게 하지 않음)
+        """
+        ttl = min(
+            settings.ADVICE_CACHE_TTL_SECONDS,
+            (get_next_base_datetime(now) - now).total_seconds()
+        )
+        self._advice_cache.set(cache_key, advice_data, ttl)
+        self._last_advice.set(cache_key[-1], advice_data, settings.ADVICE_CACHE_TTL_SECONDS * 2)
+        
+        if persist and self.advice_store is not None and ttl > 0:
+            task = asyncio.ensure_future(
+                self.advice_store.put(cache_key, advice_data, ttl, model=self.model)
+            )
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+    
+    async def pregenerate_advice(self, weather_list: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        날씨 목록의 서로 다른 시그니처별 조언을 미리 생성해 현재 슬롯 캐시에 저장
+        
+        - 이미 현재 슬롯 캐시에 있으면 건너뜀
+        - 직전 슬롯에서 같은 시그니처로 만든 조언이 있으면 GPT 없이 그대로 이어서 사용
+        - 나머지만 ADVICE_PREGENERATE_CONCURRENCY 동시 호출 제한으로 GPT 호출
+        
+        Returns:
+            {"signatures", "cached", "carried_over", "generated", "fallback"} 개수
+            (generated는 GPT 조언만, GPT 대신 규칙 기반 폴백이 된 시그니처는 fallback)
+        """
+        started = time.perf_counter()
+        now = datetime.now()
+        slot = get_base_datetime(now)
+        
+        by_signature: Dict[str, Dict[str, Any]] = {}
+        for weather_data in weather_list:
+            by_signature.setdefault(weather_signature(weather_data), weather_data)
+        
+        result = {
+            "signatures": len(by_signature),
+            "cached": 0,
+            "carried_over": 0,
+            "generated": 0,
+            "fallback": 0,
+        }
+        pending = []
+        for signature, weather_data in by_signature.items():
+            cache_key = (*slot, signature)
+            if cache_key in self._advice_cache:
+                result["cached"] += 1
+                continue
+            
+            previous = self._last_advice.get(signature)
+            if previous is not None:
+                self._store_advice(cache_key, previous, now)
+                result["carried_over"] += 1
+                continue
+            
+            pending.append(weather_data)
+        
+        semaphore = asyncio.Semaphore(settings.ADVICE_PREGENERATE_CONCURRENCY)
+        
+        async def generate(weather_data: Dict[str, Any]) -> bool:
+            async with semaphore:
+                _, fallback = await self._generate_shared_advice(weather_data)
+                return fallback
+        
+        fallbacks = await asyncio.gather(*(generate(weather_data) for weather_data in pending))
+        result["fallback"] = sum(fallbacks)
+        result["generated"] = len(pending) - result["fallback"]
+        
+        self._carried_over.inc(result["carried_over"])
+        self._pregenerated.inc(result["generated"])
+        self._pregen_fallbacks.inc(result["fallback"])
+        self._pregen_seconds.observe(time.perf_counter() - started)
+        return result
+    
+    def _record_usage(
+        self,
+        mode: str,
+        cache: str = "miss",
+        started: Optional[float] = None,
+        usage: Any = None,
+        finish_reason: Optional[str] = None,
+        fallback: Optional[str] = None
+    ):
+        """
+        조언 요청 한 건의 토큰/지연 시간을 메트릭에 더하고 구조화 로그 한 줄로 남김
+        
+        Args:
+            mode: "advice" 또는 "stream"
+            cache: 조언 캐시 "hit"/"miss" (hit이면 OpenAI를 호출하지 않음)
+            started: OpenAI 호출 시작 시각 (time.perf_counter)
+            usage: 응답의 usage (prompt/completion/total_tokens)
+            finish_reason: "length"면 max_tokens에 걸려 잘린 응답
+            fallback: 폴백 사유 ("overloaded", "error") 또는 None
+        """
+        latency = None if started is None else time.perf_counter() - started
+        if latency is not None:
+            self._latency.observe(latency)
+            record_timing("openai", latency)
+        
+        tokens = {}
+        if usage is not None:
+            tokens = {
+                "prompt": usage.prompt_tokens,
+                "completion": usage.completion_tokens,
+                "total": usage.total_tokens,
+            }
+            for kind, value in tokens.items():
+                self._tokens[kind].inc(value)
+            for kind, histogram in self._token_histograms.items():
+                histogram.observe(tokens[kind])
+        
+        if finish_reason == "length":
+            self._truncated.inc()
+        
+        usage_logger.info("openai_advice", extra={
+            "mode": mode,
+            "model": self.model,
+            "cache": cache,
+            "latency_ms": None if latency is None else round(latency * 1000, 1),
+            "prompt_tokens": tokens.get("prompt"),
+            "completion_tokens": tokens.get("completion"),
+            "total_tokens": tokens.get("total"),
+            "finish_reason": finish_reason,
+            "fallback": fallback,
+        })
+    
+    def _fallback_rate(self) -> Optional[float]:
+        """GPT 요청 중 폴백으로 응답한 비율"""
+        if not self._requests.value:
+            return None
+        return sum(counter.value for counter in self._fallbacks.values()) / self._requests.value
+    
+    def _personalize(self, advice_data: Dict[str, Any], user_name: str) -> Dict[str, Any]:
+        """공유 조언(캐시 원본은 그대로 두고)에 사용자 이름 적용"""
+        return {
+            "message": personalize_message(advice_data["message"], user_name),
+            "checklist": list(advice_data["checklist"])
+        }
     
     def _format_weather_info(self, weather_data: Dict[str, Any]) -> str:
         """날씨 정보를 읽기 쉬운 텍스트로 변환"""
@@ -0,0 +1,174 @@
+"""
+격자 하나의 단기예보 시계열 표현
+
+예보 시각마다 dict를 만들지 않고, 카테고리별로 예보 시각 길이의 타입 배열
+(array)을 하나씩 둔다. 예보 시각도 YYYYMMDDHH 정수 배열로 저장한다. 하늘상태/강수형태/강수량 같은 문자열 값은 공용 코드
+테이블로 인턴해서 정수 코드로 저장한다. 캐시에 수만 개 격자를 올려도
+항목당 메모리가 예보 시각 수에 비례해 예측 가능하게 유지된다.
+
+weather_info dict로의 변환은 응답을 만들 때(to_weather_info)만 수행한다.
+"""
+import bisect
+import math
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.services.kma_decoder import ForecastColumns
+
+
+# 하늘 상태 코드 (SKY)
+SKY_LABELS = {
+    "1": "맑음",
+    "3": "구름많음",
+    "4": "흐림"
+}
+
+# 강수 형태 코드 (PTY)
+RAIN_TYPE_LABELS = {
+    "0": "없음",
+    "1": "비",
+    "2": "비/눈",
+    "3": "눈",
+    "4": "소나기"
+}
+
+# 실수형 카테고리 (값이 없으면 NaN)
+FLOAT_CATEGORIES = ("TMP", "WSD", "POP", "REH")
+
+# 코드 테이블로 인턴하는 문자열 카테고리 (코드 0은 값 없음)
+CODED_CATEGORIES = ("SKY", "PTY", "PCP")
+
+
+class CodeTable:
+    """문자열 값 ↔ 작은 정수 코드 (0은 값 없음)"""
+
+    __slots__ = ("_codes", "_values")
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self._values: List[Optional[str]] = [None]
+
+    def __len__(self) -> int:
+        return len(self._values) - 1
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return self._values[code]
+
+
+# 프로세스 공용 코드 테이블 (모든 격자의 Forecast가 공유)
+CODE_TABLES: Dict[str, CodeTable] = {category: CodeTable() for category in CODED_CATEGORIES}
+
+
+class Forecast:
+    """
+    격자 하나의 예보 시계열
+
+    - times: 예보 시각 array('I') (YYYYMMDDHH 정수, 정렬됨)
+    - floats: 카테고리 → array('f') (예보 시각별 값, 없으면 NaN)
+    - codes: 카테고리 → array('H') (공용 코드 테이블 코드, 없으면 0)
+    """
+
+    __slots__ = ("times", "floats", "codes")
+
+    def __init__(
+        self,
+        times: array,
+        floats: Dict[str, array],
+        codes: Dict[str, array]
+    ):
+        self.times = times
+        self.floats = floats
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_columns(cls, columns: ForecastColumns) -> "Forecast":
+        """디코딩된 카테고리 컬럼을 타입 배열로 변환"""
+        columns.finalize()
+        floats = {}
+        for category in FLOAT_CATEGORIES:
+            column = columns.columns.get(category)
+            if column is not None:
+                floats[category] = array("f", (_to_float(value) for value in column))
+
+        codes = {}
+        for category in CODED_CATEGORIES:
+            column = columns.columns.get(category)
+            if column is not None:
+                table = CODE_TABLES[category]
+                codes[category] = array("H", (table.encode(value) for value in column))
+
+        times = array("I", (_time_key(date, time) for date, time in columns.times))
+        return cls(times, floats, codes)
+
+    def index_at(self, target_time: datetime) -> int:
+        """target_time 이후 가장 가까운 예보 시각 인덱스 (범위 밖이면 끝 시각)"""
+        target = (
+            (target_time.year * 100 + target_time.month) * 100 + target_time.day
+        ) * 100 + target_time.hour
+        return min(bisect.bisect_left(self.times, target), len(self.times) - 1)
+
+    def to_weather_info(self, index: int) -> Dict[str, Any]:
+        """
+        예보 시각 하나를 기존 weather_info 기본 필드 형식으로 변환
+
+        Returns:
+            temperature, precipitation, rain_probability, humidity,
+            sky_condition, rain_type, wind_speed
+        """
+        sky = self._code(index, "SKY")
+        rain_type = self._code(index, "PTY")
+
+        return {
+            "temperature": self._float(index, "TMP"),  # TMP (기온)
+            "precipitation": self._code(index, "PCP"),  # PCP (1시간 강수량)
+            "rain_probability": self._int(index, "POP"),  # POP (강수확률)
+            "humidity": self._int(index, "REH"),  # REH (습도)
+            "sky_condition": None if sky is None else SKY_LABELS.get(sky, "알수없음"),  # SKY (하늘상태)
+            "rain_type": None if rain_type is None else RAIN_TYPE_LABELS.get(rain_type, "없음"),  # PTY (강수형태)
+            "wind_speed": self._float(index, "WSD"),  # WSD (풍속)
+        }
+
+    def _float(self, index: int, category: str) -> Optional[float]:
+        column = self.floats.get(category)
+        if column is None or math.isnan(column[index]):
+            return None
+        # float32 저장 오차 제거 (기상청 값은 소수 첫째 자리까지)
+        return round(column[index], 1)
+
+    def _int(self, index: int, category: str) -> Optional[int]:
+        value = self._float(index, category)
+        return None if value is None else int(value)
+
+    def _code(self, index: int, category: str) -> Optional[str]:
+        column = self.codes.get(category)
+        if column is None:
+            return None
+        return CODE_TABLES[category].decode(column[index])
+
+
+def _time_key(fcst_date: str, fcst_time: str) -> int:
+    """("YYYYMMDD", "HHMM") → YYYYMMDDHH"""
+    return int(fcst_date) * 100 + int(fcst_time[:2])
+
+
+def _to_float(value: Optional[str]) -> float:
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
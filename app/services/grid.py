@@ -0,0 +1,109 @@
+"""
+기상청 격자 좌표 변환 (Lambert Conformal Conic 투영법)
+
+기상청 공식 알고리즘 사용
+출처: 기상청 격자 X, Y 좌표 변환 공식
+
+투영 상수는 고정값이므로 모듈 로드시 한 번만 계산한다.
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+
+# 기상청 격자 정보
+RE = 6371.00877     # 지구 반경(km)
+GRID = 5.0          # 격자 간격(km)
+SLAT1 = 30.0        # 투영 위도1(degree)
+SLAT2 = 60.0        # 투영 위도2(degree)
+OLON = 126.0        # 기준점 경도(degree)
+OLAT = 38.0         # 기준점 위도(degree)
+XO = 43             # 기준점 X좌표(GRID)
+YO = 136            # 기준점 Y좌표(GRID)
+
+DEGRAD = math.pi / 180.0
+RADDEG = 180.0 / math.pi
+
+
+def _projection_constants() -> Tuple[float, float, float, float]:
+    """투영 상수 (sn, re*sf, ro, olon) 계산"""
+    re = RE / GRID
+    slat1 = SLAT1 * DEGRAD
+    slat2 = SLAT2 * DEGRAD
+    olon = OLON * DEGRAD
+    olat = OLAT * DEGRAD
+    
+    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sf = math.pow(sf, sn) * math.cos(slat1) / sn
+    ro = math.tan(math.pi * 0.25 + olat * 0.5)
+    ro = re * sf / math.pow(ro, sn)
+    
+    return sn, re * sf, ro, olon
+
+
+SN, RE_SF, RO, OLON_RAD = _projection_constants()
+
+# 벡터 연산 결과가 정수 경계에 이 값보다 가까우면 스칼라 공식으로 재계산
+_BOUNDARY_EPS = 1e-9
+
+
+def latlon_to_grid(lat: float, lon: float) -> Tuple[int, int]:
+    """위경도 한 점을 기상청 격자 좌표(nx, ny)로 변환"""
+    ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
+    ra = RE_SF / math.pow(ra, SN)
+    theta = lon * DEGRAD - OLON_RAD
+    
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= SN
+    
+    nx = int(ra * math.sin(theta) + XO + 0.5)
+    ny = int(RO - ra * math.cos(theta) + YO + 0.5)
+    
+    return nx, ny
+
+
+def latlon_to_grid_batch(lats, lons) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    위경도 배열을 격자 좌표 배열로 한 번에 변환
+    
+    결과는 latlon_to_grid()와 완전히 같다. NumPy 삼각함수는 math 모듈과
+    마지막 비트가 다를 수 있으므로, 정수 경계에 걸친 점만 스칼라 공식으로
+    다시 계산한다.
+    
+    Returns:
+        (nx 배열, ny 배열) - 입력과 같은 shape의 int64 배열
+    """
+    lat = np.asarray(lats, dtype=np.float64)
+    lon = np.asarray(lons, dtype=np.float64)
+    if lat.shape != lon.shape:
+        raise ValueError("lats와 lons의 shape이 같아야 합니다")
+    
+    ra = np.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
+    ra = RE_SF / np.power(ra, SN)
+    theta = lon * DEGRAD - OLON_RAD
+    
+    theta = np.where(theta > math.pi, theta - 2.0 * math.pi, theta)
+    theta = np.where(theta < -math.pi, theta + 2.0 * math.pi, theta)
+    theta *= SN
+    
+    x = ra * np.sin(theta) + XO + 0.5
+    y = RO - ra * np.cos(theta) + YO + 0.5
+    
+    nx = np.trunc(x).astype(np.int64)
+    ny = np.trunc(y).astype(np.int64)
+    
+    # 정수 경계 근처 점은 스칼라 경로로 재계산해서 결과를 일치시킴
+    near_boundary = (
+        (np.abs(x - np.rint(x)) < _BOUNDARY_EPS)
+        | (np.abs(y - np.rint(y)) < _BOUNDARY_EPS)
+    )
+    for idx in zip(*np.nonzero(near_boundary)):
+        nx[idx], ny[idx] = latlon_to_grid(float(lat[idx]), float(lon[idx]))
+    
+    return nx, ny
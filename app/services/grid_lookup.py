@@ -0,0 +1,202 @@
+"""
+위경도 → 기상청 격자 사전 계산 조회 테이블
+
+한국 영역을 고정 해상도(기본 0.001°) 픽셀로 나누고, 픽셀과 주변 8개 픽셀이
+모두 하나의 격자에 속하면 그 격자 좌표(nx, ny)를 uint8로 저장한다. 격자 경계
+근처 픽셀이나 영역 밖 좌표는 0으로 표시하고 조회시 공식으로 계산한다.
+주변 픽셀까지 같은 격자일 때만 값을 두므로 조회시 부동소수점 오차로 옆 픽셀을
+읽어도 결과가 같고, 조회 경로에서 픽셀 경계 검사를 하지 않는다.
+
+테이블은 픽셀마다 (nx, ny)를 나란히 둔 (rows, cols, 2) 배열이라 조회 한 번에
+연속된 2바이트만 읽는다. .npy 파일로 저장하고 numpy.memmap(mmap_mode="r")으로
+열기 때문에 여러 워커 프로세스가 OS 페이지 캐시를 공유한다 (프로세스별 복사 없음).
+기본 영역/해상도에서 파일 크기는 약 228MB다.
+
+공식(grid.latlon_to_grid)보다 빠른지는 환경에 따라 다르므로 켜기 전에
+벤치마크로 확인한다:
+    python -m benchmarks.bench_grid_lookup
+
+생성:
+    python -m app.services.grid_lookup --output data/kma_grid_lookup.npy
+"""
+import argparse
+import json
+import math
+import os
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from app.services.grid import latlon_to_grid_batch
+
+
+# 기본 생성 영역 (기상청 단기예보 격자 영역을 포함하는 한국 주변)
+DEFAULT_LAT_RANGE = (32.0, 44.0)
+DEFAULT_LON_RANGE = (123.0, 132.5)
+DEFAULT_STEP = 0.001
+
+# 테이블 형식 버전 (주변 픽셀 검사 없이 만든 예전 테이블은 거부)
+TABLE_VERSION = 2
+
+# 생성시 한 번에 처리할 픽셀 행 수 (메모리 사용량 제한)
+_BUILD_CHUNK_ROWS = 256
+
+
+class GridLookupTable:
+    """memmap 기반 위경도 → 격자 조회 테이블"""
+
+    def __init__(self, cells: np.ndarray, lat_min: float, lon_min: float, step: float):
+        if cells.ndim != 3 or cells.shape[2] != 2 or cells.dtype != np.uint8:
+            raise ValueError(f"격자 조회 테이블 형식 오류: {cells.dtype} {cells.shape}")
+
+        self._cells = cells  # shape (rows, cols, 2), [..., 0]=nx, [..., 1]=ny
+        self.lat_min = lat_min
+        self.lon_min = lon_min
+        self.step = step
+        self.rows = cells.shape[0]
+        self.cols = cells.shape[1]
+
+        # 조회마다 속성 조회/메서드 바인딩 비용이 들지 않도록 지역 변수를 묶은 함수로 제공
+        self.lookup: Callable[[float, float], Optional[Tuple[int, int]]] = self._make_lookup()
+
+    @classmethod
+    def load(cls, path: str) -> "GridLookupTable":
+        """테이블 파일을 읽기 전용 memmap으로 열기"""
+        with open(_meta_path(path), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != TABLE_VERSION:
+            raise ValueError(f"격자 조회 테이블 버전이 다릅니다: {meta.get('version')} (다시 생성 필요)")
+
+        cells = np.load(path, mmap_mode="r")
+        return cls(cells, meta["lat_min"], meta["lon_min"], meta["step"])
+
+    def _make_lookup(self) -> Callable[[float, float], Optional[Tuple[int, int]]]:
+        # numpy 스칼라 인덱싱 대신 memmap의 원시 바이트 뷰를 직접 읽음
+        data = memoryview(self._cells).cast("B")
+        lat_min = self.lat_min
+        lon_min = self.lon_min
+        inv_step = 1.0 / self.step
+        rows = self.rows
+        cols = self.cols
+
+        def lookup(lat: float, lon: float) -> Optional[Tuple[int, int]]:
+            """
+            테이블에서 격자 좌표 조회
+
+            Returns:
+                (nx, ny) 또는 None (영역 밖/격자 경계 근처 → 공식으로 계산해야 함)
+            """
+            row = int((lat - lat_min) * inv_step)
+            col = int((lon - lon_min) * inv_step)
+            if 0 <= row < rows and 0 <= col < cols:
+                offset = (row * cols + col) << 1
+                nx = data[offset]
+                if nx:
+                    return nx, data[offset + 1]
+            return None
+
+        return lookup
+
+
+def build_lookup_table(
+    path: str,
+    lat_range: Tuple[float, float] = DEFAULT_LAT_RANGE,
+    lon_range: Tuple[float, float] = DEFAULT_LON_RANGE,
+    step: float = DEFAULT_STEP
+) -> GridLookupTable:
+    """
+    조회 테이블 생성
+
+    픽셀 네 꼭짓점이 모두 같은 격자에 속하면 픽셀 전체가 같은 격자다 (격자는
+    투영 평면에서 정사각형, 즉 볼록). 그런 픽셀 중 주변 8개 픽셀도 같은 격자인
+    픽셀만 값을 저장한다. 테이블 가장자리의 주변 픽셀은 영역 밖 한 픽셀까지
+    계산해서 판단한다 (영역 바로 밖 좌표가 0행/0열로 잘려 읽혀도 안전).
+    """
+    lat_min, lat_max = lat_range
+    lon_min, lon_max = lon_range
+    rows = int(math.ceil((lat_max - lat_min) / step))
+    cols = int(math.ceil((lon_max - lon_min) / step))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    cells = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(rows, cols, 2))
+    # 좌우 한 픽셀씩 여유를 둔 꼭짓점 경도
+    lon_edges = lon_min + np.arange(-1, cols + 2) * step
+
+    for start in range(0, rows, _BUILD_CHUNK_ROWS):
+        end = min(start + _BUILD_CHUNK_ROWS, rows)
+        # 위아래 한 픽셀씩 여유를 둔 꼭짓점 위도
+        lat_edges = lat_min + np.arange(start - 1, end + 2) * step
+        lat_grid, lon_grid = np.meshgrid(lat_edges, lon_edges, indexing="ij")
+        nx, ny = latlon_to_grid_batch(lat_grid, lon_grid)
+
+        # 픽셀별 (nx, ny)를 하나의 코드로 (한쪽만 경계에 걸친 경우도 0)
+        nx_pixels = _pure_pixels(nx).astype(np.uint16)
+        ny_pixels = _pure_pixels(ny).astype(np.uint16)
+        codes = np.where((nx_pixels > 0) & (ny_pixels > 0), (nx_pixels << 8) | ny_pixels, 0)
+
+        center = _interior_pixels(codes)
+        cells[start:end, :, 0] = center >> 8
+        cells[start:end, :, 1] = center & 0xFF
+
+    cells.flush()
+    del cells
+
+    with open(_meta_path(path), "w", encoding="utf-8") as f:
+        json.dump({"lat_min": lat_min, "lon_min": lon_min, "step": step, "version": TABLE_VERSION}, f)
+
+    return GridLookupTable.load(path)
+
+
+def _pure_pixels(corners: np.ndarray) -> np.ndarray:
+    """꼭짓점 값이 모두 같고 uint8 범위(1~255)인 픽셀만 값을, 나머지는 0을 반환"""
+    top_left = corners[:-1, :-1]
+    same = (
+        (top_left == corners[1:, :-1])
+        & (top_left == corners[:-1, 1:])
+        & (top_left == corners[1:, 1:])
+        & (top_left >= 1)
+        & (top_left <= 255)
+    )
+    return np.where(same, top_left, 0).astype(np.uint8)
+
+
+def _interior_pixels(codes: np.ndarray) -> np.ndarray:
+    """주변 8개 픽셀과 값이 같은 픽셀만 값을, 나머지는 0을 반환 (테두리 한 픽셀 제외)"""
+    center = codes[1:-1, 1:-1]
+    same = center > 0
+    rows, cols = codes.shape
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy != 1 or dx != 1:
+                same &= codes[dy:rows - 2 + dy, dx:cols - 2 + dx] == center
+    return np.where(same, center, 0).astype(np.uint16)
+
+
+def _meta_path(path: str) -> str:
+    return f"{path}.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기상청 격자 조회 테이블 생성")
+    parser.add_argument("--output", required=True, help="저장할 .npy 파일 경로")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP, help="픽셀 해상도(degree)")
+    parser.add_argument("--lat-min", type=float, default=DEFAULT_LAT_RANGE[0])
+    parser.add_argument("--lat-max", type=float, default=DEFAULT_LAT_RANGE[1])
+    parser.add_argument("--lon-min", type=float, default=DEFAULT_LON_RANGE[0])
+    parser.add_argument("--lon-max", type=float, default=DEFAULT_LON_RANGE[1])
+    args = parser.parse_args()
+
+    table = build_lookup_table(
+        args.output,
+        lat_range=(args.lat_min, args.lat_max),
+        lon_range=(args.lon_min, args.lon_max),
+        step=args.step
+    )
+    print(f"조회 테이블 생성 완료: {args.output} ({table.rows} x {table.cols})")
+
+
+if __name__ == "__main__":
+    main()
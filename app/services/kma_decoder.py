@@ -0,0 +1,130 @@
+"""
+기상청 단기예보 응답 디코더
+
+기상청 API는 dataType=JSON을 요청해도 인증 실패/호출 한도 초과 등에서는
+XML 에러 본문을 돌려준다. 전체 파싱 전에 content-type과 resultCode를 먼저
+확인해서 에러 응답을 빠르게 걸러내고, 정상 응답만 orjson으로 디코딩한다.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.exceptions import WeatherAPIError
+
+
+# 정상 응답 코드
+RESULT_OK = "00"
+
+# resultCode는 응답 앞부분(header)에 있으므로 앞쪽만 검사
+_SNIFF_BYTES = 512
+_JSON_RESULT_CODE = re.compile(rb'"resultCode"\s*:\s*"(\d+)"')
+_JSON_RESULT_MSG = re.compile(rb'"resultMsg"\s*:\s*"([^"]*)"')
+_XML_CODE = re.compile(rb"<(?:resultCode|returnReasonCode)>\s*([^<\s]+)\s*<")
+_XML_MSG = re.compile(rb"<(?:resultMsg|returnAuthMsg|errMsg)>\s*([^<]*?)\s*<")
+
+
+def decode_forecast_page(
+    content: bytes,
+    content_type: str = ""
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    기상청 응답 본문 한 페이지를 디코딩
+
+    Returns:
+        (예보 항목 목록, 전체 항목 수 totalCount)
+
+    Raises:
+        WeatherAPIError: XML 에러 본문, resultCode 오류, 응답 구조 이상
+    """
+    head = content[:_SNIFF_BYTES].lstrip()
+
+    if head.startswith(b"<") or "xml" in content_type.lower():
+        code = _search(_XML_CODE, head) or "UNKNOWN"
+        message = _search(_XML_MSG, head) or "XML 에러 응답"
+        raise WeatherAPIError(f"기상청 API 오류 ({code}): {message}")
+
+    code = _search(_JSON_RESULT_CODE, head)
+    if code is not None and code != RESULT_OK:
+        message = _search(_JSON_RESULT_MSG, head) or ""
+        raise WeatherAPIError(f"기상청 API 오류 ({code}): {message}")
+
+    try:
+        body = orjson.loads(content)["response"]["body"]
+        items = body["items"]["item"]
+        total_count = int(body.get("totalCount", len(items)))
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise WeatherAPIError(f"기상청 응답 형식 오류: {e}") from e
+
+    return items, total_count
+
+
+def _search(pattern: "re.Pattern[bytes]", data: bytes) -> Optional[str]:
+    match = pattern.search(data)
+    if match is None:
+        return None
+    return match.group(1).decode("utf-8", errors="replace")
+
+
+class ForecastColumns:
+    """
+    예보 항목을 카테고리별 컬럼으로 모은 구조
+
+    - times: 예보 시각 (fcstDate, fcstTime) 목록 (정렬됨)
+    - columns: 카테고리 → times와 같은 길이의 값 목록 (없으면 None)
+
+    페이지 단위로 add()를 호출하면 항목을 한 번만 순회하며 컬럼을 채운다.
+    """
+
+    __slots__ = ("times", "columns", "_time_index")
+
+    def __init__(self):
+        self.times: List[Tuple[str, str]] = []
+        self.columns: Dict[str, List[Optional[str]]] = {}
+        self._time_index: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def add(self, items: List[Dict[str, Any]]) -> None:
+        times = self.times
+        columns = self.columns
+        time_index = self._time_index
+
+        for item in items:
+            key = (item["fcstDate"], item["fcstTime"])
+            index = time_index.get(key)
+            if index is None:
+                index = len(times)
+                time_index[key] = index
+                times.append(key)
+
+            column = columns.get(item["category"])
+            if column is None:
+                column = columns[item["category"]] = []
+
+            missing = index - len(column)
+            if missing > 0:
+                column.extend([None] * missing)
+            if missing >= 0:
+                column.append(item["fcstValue"])
+            else:
+                column[index] = item["fcstValue"]
+
+    def finalize(self) -> "ForecastColumns":
+        """컬럼 길이를 맞추고 시각 순으로 정렬"""
+        size = len(self.times)
+        for column in self.columns.values():
+            if len(column) < size:
+                column.extend([None] * (size - len(column)))
+
+        if any(a > b for a, b in zip(self.times, self.times[1:])):
+            order = sorted(range(size), key=self.times.__getitem__)
+            self.times = [self.times[i] for i in order]
+            self.columns = {
+                category: [column[i] for i in order]
+                for category, column in self.columns.items()
+            }
+            self._time_index = {key: i for i, key in enumerate(self.times)}
+
+        return self
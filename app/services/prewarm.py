@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.ai_service import AIService
+from app.services.weather_service import WeatherService, get_base_datetime, get_next_base_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastPrewarmer:
+    """
+    기상청 발표 직후 인기 격자 예보를 미리 가져오는 백그라운드 작업
+
+    요청 경로에서 기상청 호출을 기다리지 않도록, 각 base_time 발표분이 제공되는
+    시점(발표 시각 + KMA_PUBLISH_DELAY_SECONDS, +지터)에 상위 N개 격자의 다음 슬롯
+    예보를 캐시에 채운다. 프리워밍을 켜면 요청 경로의 슬롯 전환이
+    PREWARM_LEAD_SECONDS만큼 늦춰지므로, 요청이 새 슬롯을 쓰기 전에 채워진다.
+    ai_service가 주어지고 ADVICE_PREGENERATE_ENABLED이면 전환 뒤에 채운 격자들의
+    날씨 시그니처별 조언도 미리 생성한다.
+    """
+
+    def __init__(self, weather_service: WeatherService, ai_service: Optional[AIService] = None):
+        self.weather_service = weather_service
+        self.ai_service = ai_service
+        self._task: Optional[asyncio.Task] = None
+
+        self._cycles = metrics.counter("prewarm.cycles")
+        self._warmed = metrics.counter("prewarm.cells_warmed")
+        self._failed = metrics.counter("prewarm.cells_failed")
+        self._cycle_seconds = metrics.histogram("prewarm.cycle_seconds")
+
+    def start(self) -> None:
+        """백그라운드 작업 시작 (애플리케이션 시작시 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 작업 종료 (애플리케이션 종료시 호출)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._seconds_until_next_cycle(datetime.now()))
+            switch_at = get_next_base_datetime(datetime.now())
+            try:
+                await self.run_cycle(get_base_datetime(switch_at))
+            except Exception as e:
+                logger.exception("예보 프리워밍 실패: %s", e)
+                continue
+            
+            # 조언은 현재 슬롯 기준으로 만들어지므로 슬롯 전환 뒤에 생성
+            await asyncio.sleep(max(0.0, (switch_at - datetime.now()).total_seconds()))
+            if self.ai_service is not None and settings.ADVICE_PREGENERATE_ENABLED:
+                try:
+                    await self.pregenerate_advice()
+                except Exception as e:
+                    logger.exception("조언 사전 생성 실패: %s", e)
+
+    def _seconds_until_next_cycle(self, now: datetime) -> float:
+        """
+        다음 발표분 제공 시각 + 지터까지 남은 초
+
+        슬롯 전환 시각보다 PREWARM_LEAD_SECONDS 앞이므로, 지터가 리드보다 작으면
+        요청이 새 슬롯으로 넘어가기 전에 프리워밍이 시작된다.
+        """
+        target = get_next_base_datetime(now).timestamp() - settings.PREWARM_LEAD_SECONDS
+
+        # 여러 워커/서버가 동시에 기상청을 호출하지 않도록 지터 추가
+        target += random.uniform(0, settings.PREWARM_JITTER_SECONDS)
+        return max(0.0, target - now.timestamp())
+
+    async def run_cycle(self, slot: Optional[Tuple[str, str]] = None) -> Tuple[int, int]:
+        """
+        인기 격자 상위 N개의 slot(기본값: 현재 슬롯) 예보를 캐시에 채움
+
+        Args:
+            slot: 채울 (base_date, base_time), 주기 작업은 곧 전환될 다음 슬롯을 넘김
+
+        Returns:
+            (성공 격자 수, 실패 격자 수)
+        """
+        started = time.perf_counter()
+        slot = slot or get_base_datetime()
+        cells = self.weather_service.popularity.top(settings.PREWARM_TOP_N)
+        semaphore = asyncio.Semaphore(settings.PREWARM_CONCURRENCY)
+
+        async def warm(cell: Tuple[int, int]) -> bool:
+            async with semaphore:
+                try:
+                    await self.weather_service.warm_forecast(*cell, slot=slot)
+                    return True
+                except Exception as e:
+                    logger.warning("격자 %s 프리워밍 실패: %s", cell, e)
+                    return False
+
+        results = await asyncio.gather(*(warm(cell) for cell in cells))
+        warmed = sum(results)
+        failed = len(results) - warmed
+
+        self._cycles.inc()
+        self._warmed.inc(warmed)
+        self._failed.inc(failed)
+        self._cycle_seconds.observe(time.perf_counter() - started)
+
+        return warmed, failed
+
+    async def pregenerate_advice(self) -> dict:
+        """캐시에 채워진 인기 격자의 현재 날씨로 시그니처별 조언 사전 생성"""
+        cells = self.weather_service.popularity.top(settings.PREWARM_TOP_N)
+        weather_list = []
+        for nx, ny in cells:
+            weather_info = self.weather_service.peek_weather_info(nx, ny)
+            if weather_info is not None:
+                weather_list.append(weather_info)
+
+        return await self.ai_service.pregenerate_advice(weather_list)
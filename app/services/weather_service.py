@@ -1,7 +1,84 @@
+import asyncio
+import logging
 import httpx
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.exceptions import WeatherAPIError
+from app.core.logging import set_grid_cell, stage_timer
+from app.core.metrics import metrics
+from app.core.popularity import PopularityTracker
+from app.core.singleflight import SingleFlight
+from app.services.grid import latlon_to_grid, latlon_to_grid_batch
+from app.services.grid_lookup import GridLookupTable
+from app.services.forecast import Forecast
+from app.services.kma_decoder import ForecastColumns, decode_forecast_page
+
+logger = logging.getLogger(__name__)
+
+
+# 기상청 단기예보 발표 시각 (0200, 0500, 0800, 1100, 1400, 1700, 2000, 2300)
+KMA_BASE_HOURS = (2, 5, 8, 11, 14, 17, 20, 23)
+
+
+def slot_switch_delay() -> float:
+    """
+    발표 시각(hh:00)부터 요청이 새 발표분으로 넘어가기까지의 지연(초)
+    
+    기상청 제공 지연(KMA_PUBLISH_DELAY_SECONDS) 뒤에, 프리워밍을 켰으면
+    PREWARM_LEAD_SECONDS만큼 더 기다려서 인기 격자가 미리 채워진 뒤 전환함
+    """
+    delay = settings.KMA_PUBLISH_DELAY_SECONDS
+    if settings.PREWARM_ENABLED:
+        delay += settings.PREWARM_LEAD_SECONDS
+    return delay
+
+
+def _available_slot_time(now: datetime) -> datetime:
+    """슬롯 전환 지연을 뺀 기준 시각"""
+    return now - timedelta(seconds=slot_switch_delay())
+
+
+def get_base_datetime(now: Optional[datetime] = None) -> Tuple[str, str]:
+    """
+    현재 시각 기준으로 조회할 예보의 base_date, base_time 계산
+    
+    기상청은 발표 시각(hh:00)보다 약 10분 늦게 예보를 제공하므로,
+    slot_switch_delay()가 지난 뒤에 다음 발표분으로 넘어감
+    
+    Returns:
+        ("YYYYMMDD", "HHMM")
+    """
+    shifted = _available_slot_time(now or datetime.now())
+    
+    past_hours = [h for h in KMA_BASE_HOURS if h <= shifted.hour]
+    if not past_hours:
+        # 02시 발표분으로 전환하기 전에는 전날 2300 발표분 사용
+        previous_day = shifted - timedelta(days=1)
+        return previous_day.strftime("%Y%m%d"), "2300"
+    
+    return shifted.strftime("%Y%m%d"), f"{past_hours[-1]:02d}00"
+
+
+def get_next_base_datetime(now: Optional[datetime] = None) -> datetime:
+    """다음 발표분으로 전환되는 시각 (현재 슬롯의 캐시 만료 시각)"""
+    shifted = _available_slot_time(now or datetime.now())
+    delay = timedelta(seconds=slot_switch_delay())
+    
+    for hour in KMA_BASE_HOURS:
+        if hour > shifted.hour:
+            return shifted.replace(hour=hour, minute=0, second=0, microsecond=0) + delay
+    
+    # 2300 발표분 이후에는 다음날 0200 발표분
+    next_day = shifted + timedelta(days=1)
+    return next_day.replace(hour=KMA_BASE_HOURS[0], minute=0, second=0, microsecond=0) + delay
+
+
+def get_slot_expiry(base_date: str, base_time: str) -> datetime:
+    """해당 발표분 슬롯이 끝나는 시각 (전환 전에 미리 받은 예보도 슬롯 끝까지 캐시)"""
+    switched = datetime.strptime(base_date + base_time, "%Y%m%d%H%M") + timedelta(seconds=slot_switch_delay())
+    return get_next_base_datetime(switched)
 
 
 class WeatherService:
@@ -9,94 +86,272 @@ class WeatherService:
     
     def __init__(self):
         self.api_key = settings.KMA_API_KEY
-        # 기상청 API Hub 엔드포인트 사용
-        self.base_url = "https://apihub.kma.go.kr/api/typ02/openApi/VilageFcstInfoService_2.0/getVilageFcst"
+        # 기상청 API Hub 엔드포인트 사용 (설정으로 로컬 에뮬레이터로 전환 가능)
+        self.base_url = settings.KMA_BASE_URL
+        
+        # 격자 + 발표 시각 단위 예보 캐시 (같은 5km 격자 사용자는 같은 예보를 공유)
+        self._forecast_cache = TTLCache(maxsize=settings.FORECAST_CACHE_SIZE)
+        # 같은 격자에 대한 동시 요청은 기상청 호출 한 번으로 합침
+        self._inflight = SingleFlight()
+        
+        # 격자별 직전 예보 (기상청 실패/지연시 stale로 응답) 및 최근 실패 기록
+        self._last_forecasts = TTLCache(maxsize=settings.FORECAST_CACHE_SIZE)
+        self._failed_fetches = TTLCache(maxsize=settings.FORECAST_CACHE_SIZE)
+        self._stale_served = metrics.counter("forecast.stale_served")
+        self._dummy_served = metrics.counter("forecast.dummy_served")
+        
+        # 격자별 요청 빈도 (발표 직후 프리워밍 대상 선정용)
+        self.popularity = PopularityTracker(
+            maxsize=settings.POPULARITY_MAX_CELLS,
+            half_life=settings.POPULARITY_HALF_LIFE_SECONDS
+        )
+        
+        metrics.register_collector("forecast_cache", self._forecast_cache.stats)
+        metrics.register_collector("forecast_inflight", self._inflight.stats)
+        
+        # 위경도 → 격자 조회 테이블 (선택, memmap으로 워커 간 공유)
+        self._grid_lookup = self._load_grid_lookup(settings.GRID_LOOKUP_PATH)
+        
+        # 프로세스 공용 HTTP 클라이언트 (main.py 시작/종료 이벤트에서 관리)
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def start(self):
+        """공용 HTTP 클라이언트 생성 (애플리케이션 시작시 호출)"""
+        if self._client is None:
+            self._client = self._create_client()
+    
+    async def close(self):
+        """공용 HTTP 클라이언트 종료 (애플리케이션 종료시 호출)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """커넥션 풀/keep-alive가 설정된 기상청 API 클라이언트 생성"""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.KMA_READ_TIMEOUT,
+                connect=settings.KMA_CONNECT_TIMEOUT,
+                read=settings.KMA_READ_TIMEOUT,
+                pool=settings.KMA_POOL_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.KMA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.KMA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.KMA_KEEPALIVE_EXPIRY
+            ),
+            http2=settings.KMA_HTTP2
+        )
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """공용 클라이언트 반환 (start() 없이 사용하는 스크립트/테스트용으로 지연 생성)"""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+    
+    def _load_grid_lookup(self, path: str) -> Optional[GridLookupTable]:
+        """격자 조회 테이블 로드 (없거나 실패하면 공식으로만 계산)"""
+        if not path:
+            return None
+        try:
+            return GridLookupTable.load(path)
+        except Exception as e:
+            logger.warning("격자 조회 테이블 로드 실패: %s", e)
+            return None
     
     def _convert_to_grid(self, lat: float, lon: float) -> tuple[int, int]:
         """
         위경도를 기상청 격자 좌표로 변환 (Lambert Conformal Conic 투영법)
         
-        기상청 공식 알고리즘 사용
-        출처: 기상청 격자 X, Y 좌표 변환 공식
+        조회 테이블이 있으면 한 번의 인덱스 조회로 처리하고,
+        격자 경계/영역 밖 좌표는 공식으로 정확히 계산
+        """
+        if self._grid_lookup is not None:
+            cell = self._grid_lookup.lookup(lat, lon)
+            if cell is not None:
+                return cell
+        return latlon_to_grid(lat, lon)
+    
+    def group_by_grid(
+        self,
+        points: Sequence[Tuple[float, float]]
+    ) -> Dict[Tuple[int, int], List[int]]:
         """
-        import math
-        
-        # 기상청 격자 정보
-        RE = 6371.00877     # 지구 반경(km)
-        GRID = 5.0          # 격자 간격(km)
-        SLAT1 = 30.0        # 투영 위도1(degree)
-        SLAT2 = 60.0        # 투영 위도2(degree)
-        OLON = 126.0        # 기준점 경도(degree)
-        OLAT = 38.0         # 기준점 위도(degree)
-        XO = 43             # 기준점 X좌표(GRID)
-        YO = 136            # 기준점 Y좌표(GRID)
-        
-        DEGRAD = math.pi / 180.0
-        RADDEG = 180.0 / math.pi
-        
-        re = RE / GRID
-        slat1 = SLAT1 * DEGRAD
-        slat2 = SLAT2 * DEGRAD
-        olon = OLON * DEGRAD
-        olat = OLAT * DEGRAD
-        
-        sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
-        sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
-        sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
-        sf = math.pow(sf, sn) * math.cos(slat1) / sn
-        ro = math.tan(math.pi * 0.25 + olat * 0.5)
-        ro = re * sf / math.pow(ro, sn)
-        
-        ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
-        ra = re * sf / math.pow(ra, sn)
-        theta = lon * DEGRAD - olon
-        
-        if theta > math.pi:
-            theta -= 2.0 * math.pi
-        if theta < -math.pi:
-            theta += 2.0 * math.pi
-        theta *= sn
-        
-        nx = int(ra * math.sin(theta) + XO + 0.5)
-        ny = int(ro - ra * math.cos(theta) + YO + 0.5)
-        
-        return nx, ny
+        위경도 목록을 격자별 인덱스 목록으로 묶음 (배치 요청에서 격자당 한 번만 조회)
+        
+        조회 테이블 유무와 관계없이 NumPy 일괄 변환을 사용
+        (결과는 _convert_to_grid와 동일하고, 점 단위 테이블 조회보다 빠름)
+        """
+        if points:
+            lats, lons = zip(*points)
+            nx, ny = latlon_to_grid_batch(lats, lons)
+            cells = zip(nx.tolist(), ny.tolist())
+        else:
+            cells = []
+        
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for index, cell in enumerate(cells):
+            groups.setdefault(tuple(cell), []).append(index)
+        return groups
     
-    async def get_weather_forecast(self, lat: float, lon: float) -> Dict[str, Any]:
+    async def get_weather_forecast(
+        self,
+        lat: float,
+        lon: float,
+        target_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         위경도 기반으로 기상청 단기예보 데이터 가져오기
+        
+        Args:
+            target_time: 조회할 예보 시각 (기본값: 현재 시각).
+                격자별 예보 전체를 슬롯당 한 번만 받아 두므로 이후 시각도
+                추가 기상청 호출 없이 조회됨
         """
         nx, ny = self._convert_to_grid(lat, lon)
+        return await self.get_grid_forecast(nx, ny, target_time)
+    
+    async def get_grid_forecast(
+        self,
+        nx: int,
+        ny: int,
+        target_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """기상청 격자 좌표로 단기예보 조회 (get_weather_forecast와 동일한 결과)"""
+        set_grid_cell(f"{nx},{ny}")
+        self.popularity.record((nx, ny))
         
         # 현재 시간 기준 base_date, base_time 설정
         now = datetime.now()
-        base_date = now.strftime("%Y%m%d")
-        
-        # 기상청 API는 특정 시간에만 업데이트 (0200, 0500, 0800, 1100, 1400, 1700, 2000, 2300)
-        hour = now.hour
-        if hour < 2:
-            base_time = "2300"
-            base_date = (now.replace(hour=0) - datetime.timedelta(days=1)).strftime("%Y%m%d")
-        elif hour < 5:
-            base_time = "0200"
-        elif hour < 8:
-            base_time = "0500"
-        elif hour < 11:
-            base_time = "0800"
-        elif hour < 14:
-            base_time = "1100"
-        elif hour < 17:
-            base_time = "1400"
-        elif hour < 20:
-            base_time = "1700"
-        elif hour < 23:
-            base_time = "2000"
-        else:
-            base_time = "2300"
+        base_date, base_time = get_base_datetime(now)
+        
+        # 같은 격자 + 같은 발표 시각이면 캐시된 예보 사용
+        cache_key = (nx, ny, base_date, base_time)
+        forecast = self._forecast_cache.get(cache_key)
+        stale = False
+        
+        if forecast is None:
+            with stage_timer("forecast_fetch"):
+                forecast, stale = await self._fetch_or_stale(nx, ny, base_date, base_time)
+            if forecast is None:
+                # 직전 예보도 없을 때만 더미 데이터 반환 (캐시하지 않음)
+                self._dummy_served.inc()
+                return self._get_dummy_weather_data()
+        
+        try:
+            return self._build_weather_info(forecast, target_time or now, stale=stale)
+        except Exception as e:
+            logger.exception("날씨 데이터 파싱 실패: %s", e)
+            self._dummy_served.inc()
+            return self._get_dummy_weather_data()
+    
+    def peek_weather_info(
+        self,
+        nx: int,
+        ny: int,
+        target_time: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        현재 슬롯 캐시에 있는 격자 예보만 조회 (없으면 None, 기상청 호출 없음)
+        """
+        now = datetime.now()
+        forecast = self._forecast_cache.get((nx, ny, *get_base_datetime(now)))
+        if forecast is None:
+            return None
+        return self._build_weather_info(forecast, target_time or now)
+    
+    async def _fetch_or_stale(
+        self,
+        nx: int,
+        ny: int,
+        base_date: str,
+        base_time: str
+    ) -> Tuple[Optional[Forecast], bool]:
+        """
+        현재 슬롯 예보 조회 (stale-while-revalidate)
+        
+        - 지연 예산(FORECAST_LATENCY_BUDGET_SECONDS) 안에 받으면 최신 예보
+        - 예산 초과/실패시 격자의 직전 예보를 stale로 반환하고,
+          진행 중인 기상청 호출은 백그라운드에서 계속 캐시를 갱신
+        - 직전 예보가 없으면 호출이 끝날 때까지 기다림
+        
+        Returns:
+            (예보 또는 None, stale 여부)
+        """
+        cache_key = (nx, ny, base_date, base_time)
+        last_forecast = self._last_forecasts.get((nx, ny))
+        
+        def fetch():
+            return self._fetch_forecast(nx, ny, base_date, base_time)
+        
+        # 최근 실패한 격자는 재시도 간격 동안 바로 직전 예보로 응답
+        if last_forecast is not None and cache_key in self._failed_fetches:
+            self._stale_served.inc()
+            return last_forecast, True
         
+        try:
+            if last_forecast is None:
+                return await self._inflight.do(cache_key, fetch), False
+            
+            # 공유 호출은 shield되어 있으므로 타임아웃이 나도 백그라운드에서 계속 진행
+            forecast = await asyncio.wait_for(
+                self._inflight.do(cache_key, fetch),
+                timeout=settings.FORECAST_LATENCY_BUDGET_SECONDS
+            )
+            return forecast, False
+        
+        except asyncio.TimeoutError:
+            logger.warning("기상청 API 응답 지연: 격자 (%d, %d) 직전 예보로 응답", nx, ny)
+        except Exception as e:
+            logger.warning("기상청 API 호출 실패: %s", e)
+            self._failed_fetches.set(cache_key, True, settings.FORECAST_RETRY_BACKOFF_SECONDS)
+        
+        if last_forecast is None:
+            return None, False
+        
+        self._stale_served.inc()
+        return last_forecast, True
+    
+    async def warm_forecast(
+        self,
+        nx: int,
+        ny: int,
+        slot: Optional[Tuple[str, str]] = None
+    ) -> None:
+        """
+        슬롯(기본값: 현재 슬롯) 예보를 캐시에 미리 채움 (프리워밍용)
+        
+        프리워머는 전환 직전에 다음 슬롯을 넘겨서 요청이 새 슬롯을 쓰기 전에 채움.
+        이미 캐시에 있으면 호출하지 않고, 실패시 예외를 그대로 올림
+        """
+        base_date, base_time = slot or get_base_datetime()
+        cache_key = (nx, ny, base_date, base_time)
+        if cache_key in self._forecast_cache:
+            return
+        
+        await self._inflight.do(
+            cache_key,
+            lambda: self._fetch_forecast(nx, ny, base_date, base_time)
+        )
+    
+    async def _fetch_forecast(
+        self,
+        nx: int,
+        ny: int,
+        base_date: str,
+        base_time: str
+    ) -> Forecast:
+        """
+        기상청 API를 호출해 예보를 가져오고 다음 발표 시각까지 캐시
+        
+        KMA_FULL_FORECAST 모드에서는 페이지를 끝까지 따라가서 단기예보 전체
+        (약 3일치)를 받아 예보 시각 × 카테고리 컬럼으로 정리해 둠
+        
+        실패시 예외를 그대로 올려서 같은 격자를 기다리던 모든 호출자에게 전달
+        """
         params = {
             "authKey": self.api_key,  # 기상청 API Hub는 authKey 사용
-            "numOfRows": "60",
+            "numOfRows": str(settings.KMA_NUM_OF_ROWS if settings.KMA_FULL_FORECAST else 60),
             "pageNo": "1",
             "dataType": "JSON",
             "base_date": base_date,
@@ -105,64 +360,63 @@ class WeatherService:
             "ny": ny
         }
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.base_url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                
-                # 데이터 정제
-                return self._parse_weather_data(data)
-                
-        except Exception as e:
-            print(f"기상청 API 호출 실패: {e}")
-            # MVP: 실패시 더미 데이터 반환
-            return self._get_dummy_weather_data()
+        columns = ForecastColumns()
+        page = 1
+        fetched = 0
+        while True:
+            params["pageNo"] = str(page)
+            response = await self._get_client().get(self.base_url, params=params)
+            response.raise_for_status()
+            
+            # 에러 응답(XML/resultCode)을 먼저 거르고 카테고리별 컬럼으로 정리
+            items, total_count = decode_forecast_page(
+                response.content,
+                response.headers.get("content-type", "")
+            )
+            columns.add(items)
+            fetched += len(items)
+            
+            if not settings.KMA_FULL_FORECAST or not items or fetched >= total_count:
+                break
+            page += 1
+        
+        if not columns:
+            raise WeatherAPIError("기상청 예보 데이터가 비어 있습니다")
+        
+        # 캐시에는 타입 배열 기반 시계열로 보관
+        forecast = Forecast.from_columns(columns)
+        
+        # 이 슬롯이 끝날 때(다음 발표분으로 전환될 때)까지 캐시
+        ttl = (get_slot_expiry(base_date, base_time) - datetime.now()).total_seconds()
+        self._forecast_cache.set((nx, ny, base_date, base_time), forecast, ttl)
+        
+        # 다음 슬롯 호출이 실패/지연될 때 stale로 응답할 직전 예보
+        self._last_forecasts.set((nx, ny), forecast, settings.FORECAST_STALE_MAX_AGE_SECONDS)
+        self._failed_fetches.pop((nx, ny, base_date, base_time))
+        
+        return forecast
     
-    def _parse_weather_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_weather_info(
+        self,
+        forecast: Forecast,
+        target_time: datetime,
+        stale: bool = False
+    ) -> Dict[str, Any]:
         """
-        기상청 API 응답을 깔끔하게 정제
+        예보 시계열에서 target_time에 해당하는 시각의 weather_info 생성
+        
+        target_time 이후 가장 가까운 예보 시각을 사용하고,
+        범위를 벗어나면 가장 가까운 끝 시각을 사용
         """
-        try:
-            items = data["response"]["body"]["items"]["item"]
-            
-            # 필요한 데이터만 추출
-            weather_info = {
-                "temperature": None,  # TMP (기온)
-                "precipitation": None,  # PCP (1시간 강수량)
-                "rain_probability": None,  # POP (강수확률)
-                "humidity": None,  # REH (습도)
-                "sky_condition": None,  # SKY (하늘상태)
-                "rain_type": None,  # PTY (강수형태)
-                "wind_speed": None,  # WSD (풍속)
-            }
-            
-            # 가장 최근 예보 데이터 파싱
-            for item in items[:12]:  # 앞쪽 12개만 (3시간치)
-                category = item["category"]
-                value = item["fcstValue"]
-                
-                if category == "TMP" and weather_info["temperature"] is None:
-                    weather_info["temperature"] = float(value)
-                elif category == "POP" and weather_info["rain_probability"] is None:
-                    weather_info["rain_probability"] = int(value)
-                elif category == "REH" and weather_info["humidity"] is None:
-                    weather_info["humidity"] = int(value)
-                elif category == "SKY" and weather_info["sky_condition"] is None:
-                    weather_info["sky_condition"] = self._interpret_sky(value)
-                elif category == "PTY" and weather_info["rain_type"] is None:
-                    weather_info["rain_type"] = self._interpret_rain_type(value)
-                elif category == "WSD" and weather_info["wind_speed"] is None:
-                    weather_info["wind_speed"] = float(value)
-                elif category == "PCP" and weather_info["precipitation"] is None:
-                    weather_info["precipitation"] = value
-            
-            # 프론트엔드용 추가 정보 생성
-            return self._enrich_weather_data(weather_info)
-            
-        except Exception as e:
-            print(f"날씨 데이터 파싱 실패: {e}")
-            return self._get_dummy_weather_data()
+        weather_info = forecast.to_weather_info(forecast.index_at(target_time))
+        
+        # 프론트엔드용 추가 정보 생성
+        weather_info = self._enrich_weather_data(weather_info)
+        
+        # 이전 발표 예보로 응답한 경우 표시
+        weather_info["stale"] = stale
+        weather_info["fallback"] = False
+        return weather_info
     
     def _enrich_weather_data(self, weather_info: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -412,28 +666,12 @@ class WeatherService:
         }
         return mood_emojis.get(mood, "😐")
     
-    def _interpret_sky(self, code: str) -> str:
-        """하늘 상태 코드 해석"""
-        sky_codes = {
-            "1": "맑음",
-            "3": "구름많음",
-            "4": "흐림"
-        }
-        return sky_codes.get(code, "알수없음")
-    
-    def _interpret_rain_type(self, code: str) -> str:
-        """강수 형태 코드 해석"""
-        rain_codes = {
-            "0": "없음",
-            "1": "비",
-            "2": "비/눈",
-            "3": "눈",
-            "4": "소나기"
-        }
-        return rain_codes.get(code, "없음")
-    
     def _get_dummy_weather_data(self) -> Dict[str, Any]:
-        """MVP용 더미 데이터"""
+        """
+        기상청 예보도 직전 예보도 없을 때의 기본값 (실제 예보 아님)
+        
+        fallback=True로 표시해서 클라이언트가 실제 예보와 구분할 수 있게 함
+        """
         base_data = {
             "temperature": 15.0,
             "precipitation": "없음",
@@ -443,4 +681,7 @@ class WeatherService:
             "rain_type": "없음",
             "wind_speed": 2.5,
         }
-        return self._enrich_weather_data(base_data)
+        weather_info = self._enrich_weather_data(base_data)
+        weather_info["stale"] = True
+        weather_info["fallback"] = True
+        return weather_info
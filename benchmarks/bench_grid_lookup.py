@@ -0,0 +1,66 @@
+"""
+위경도 → 격자 변환 마이크로 벤치마크
+
+공식(latlon_to_grid), memmap 조회 테이블(GridLookupTable, 경계/영역 밖은
+공식으로 대체), NumPy 일괄 변환(latlon_to_grid_batch)의 점 1개당 처리 시간을
+비교한다. 조회 테이블(GRID_LOOKUP_PATH)은 이 환경에서 공식보다 빠를 때만 켠다.
+
+실행:
+    python -m benchmarks.bench_grid_lookup
+"""
+import tempfile
+import timeit
+
+import numpy as np
+
+from app.services.grid import latlon_to_grid, latlon_to_grid_batch
+from app.services.grid_lookup import build_lookup_table
+
+
+# 서울 주변 1° × 1° 영역, 기본 해상도(0.001°)
+LAT_RANGE = (37.0, 38.0)
+LON_RANGE = (126.5, 127.5)
+STEP = 0.001
+POINTS = 10000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(*LAT_RANGE, POINTS).tolist()
+    lons = rng.uniform(*LON_RANGE, POINTS).tolist()
+    points = list(zip(lats, lons))
+
+    with tempfile.TemporaryDirectory() as directory:
+        table = build_lookup_table(
+            f"{directory}/grid.npy", lat_range=LAT_RANGE, lon_range=LON_RANGE, step=STEP
+        )
+
+        def formula():
+            for lat, lon in points:
+                latlon_to_grid(lat, lon)
+
+        def lookup(table_lookup=table.lookup):
+            # WeatherService._convert_to_grid와 같은 경로 (없으면 공식으로 대체)
+            for lat, lon in points:
+                table_lookup(lat, lon) or latlon_to_grid(lat, lon)
+
+        def batch():
+            latlon_to_grid_batch(lats, lons)
+
+        hits = sum(table.lookup(lat, lon) is not None for lat, lon in points)
+        print(f"table: {table.rows} x {table.cols}, step {STEP}°, hit rate {hits / POINTS:.1%}")
+
+        results = {}
+        for name, func in (("formula", formula), ("lookup table", lookup), ("numpy batch", batch)):
+            best = min(timeit.repeat(func, number=5, repeat=5)) / 5
+            results[name] = best / POINTS
+            print(f"{name:>14}: {results[name] * 1e6:6.3f} µs / point")
+
+    if results["lookup table"] < results["formula"]:
+        print("조회 테이블이 공식보다 빠름: GRID_LOOKUP_PATH 사용 권장")
+    else:
+        print("조회 테이블이 공식보다 느림: GRID_LOOKUP_PATH를 비워 두세요")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+기상청 응답 디코딩 마이크로 벤치마크
+
+기존 방식(response.json() + 항목 dict 순회)과 kma_decoder(orjson +
+resultCode 선검사 + 카테고리 컬럼) 방식의 항목 1,000개당 처리 시간을 비교
+
+실행:
+    python -m benchmarks.bench_kma_decode
+"""
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from app.services.kma_decoder import ForecastColumns, decode_forecast_page
+
+
+CATEGORIES = {
+    "TMP": "15", "UUU": "1.2", "VVV": "-0.5", "VEC": "250", "WSD": "2.1", "SKY": "3",
+    "PTY": "0", "POP": "20", "WAV": "0", "PCP": "강수없음", "REH": "55", "SNO": "적설없음",
+}
+
+
+def make_payload(hours: int = 80) -> bytes:
+    """단기예보 전체와 비슷한 크기(약 1,000개 항목)의 응답 본문 생성"""
+    start = datetime(2024, 3, 1, 6)
+    items = []
+    for offset in range(hours):
+        when = start + timedelta(hours=offset)
+        for category, value in CATEGORIES.items():
+            items.append({
+                "baseDate": "20240301",
+                "baseTime": "0500",
+                "category": category,
+                "fcstDate": when.strftime("%Y%m%d"),
+                "fcstTime": when.strftime("%H00"),
+                "fcstValue": value,
+                "nx": 60,
+                "ny": 127,
+            })
+    return json.dumps({
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": items},
+                "pageNo": 1,
+                "numOfRows": len(items),
+                "totalCount": len(items),
+            },
+        }
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def decode_legacy(content: bytes):
+    """기존 방식: json 디코딩 후 (fcstDate, fcstTime, category) dict 색인"""
+    data = json.loads(content)
+    items = data["response"]["body"]["items"]["item"]
+    values = {}
+    for item in items:
+        values[(item["fcstDate"], item["fcstTime"], item["category"])] = item["fcstValue"]
+    times = sorted({(date, time) for date, time, _ in values})
+    return times, values
+
+
+def decode_columns(content: bytes):
+    """새 방식: resultCode 선검사 + orjson + 카테고리 컬럼"""
+    items, _ = decode_forecast_page(content, "application/json")
+    columns = ForecastColumns()
+    columns.add(items)
+    return columns.finalize()
+
+
+def main():
+    payload = make_payload()
+    item_count = len(json.loads(payload)["response"]["body"]["items"]["item"])
+    error_payload = (
+        b"<OpenAPI_ServiceResponse><cmmMsgHeader>"
+        b"<errMsg>SERVICE ERROR</errMsg><returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+        b"<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+    )
+
+    def decode_error():
+        try:
+            decode_forecast_page(error_payload, "text/xml")
+        except Exception:
+            pass
+
+    cases = [
+        ("legacy json + dict", lambda: decode_legacy(payload)),
+        ("orjson + columns", lambda: decode_columns(payload)),
+    ]
+
+    print(f"payload: {item_count} items, {len(payload):,} bytes")
+    for name, func in cases:
+        runs = 200
+        best = min(timeit.repeat(func, number=runs, repeat=5)) / runs
+        print(f"{name:>20}: {best * 1e6 / item_count * 1000:8.1f} µs / 1,000 items")
+
+    runs = 10000
+    best = min(timeit.repeat(decode_error, number=runs, repeat=5)) / runs
+    print(f"{'xml error reject':>20}: {best * 1e6:8.2f} µs / response")
+
+
+if __name__ == "__main__":
+    main()
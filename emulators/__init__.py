@@ -0,0 +1,14 @@
+"""
+기상청/OpenAI API 로컬 에뮬레이터 (오프라인 성능 측정용 ASGI 앱)
+
+실행:
+    uvicorn emulators.kma_emulator:app --port 9001
+    uvicorn emulators.openai_emulator:app --port 9002
+
+서버 설정(.env):
+    KMA_BASE_URL=http://localhost:9001/getVilageFcst
+    OPENAI_BASE_URL=http://localhost:9002/v1
+
+지연/실패 주입은 환경변수(KMA_EMULATOR_*, OPENAI_EMULATOR_*)나
+실행 중 PUT /_faults 로 조정한다 (emulators.faults 참고).
+"""
@@ -0,0 +1,85 @@
+"""
+에뮬레이터 공용 지연/실패 주입
+
+- LATENCY_MS: 응답 지연 중앙값(ms)
+- LATENCY_SIGMA: 로그정규 분포 sigma (0이면 고정 지연, 클수록 꼬리가 김)
+- ERROR_RATE: 에러 응답 비율 (0~1)
+- TIMEOUT_RATE: 응답하지 않고 TIMEOUT_SECONDS 동안 붙잡는 비율 (0~1)
+- SEED: 난수 시드 (재현용, 비어 있으면 무작위)
+"""
+import asyncio
+import math
+import random
+from typing import Optional
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings
+
+
+class FaultSettings(BaseSettings):
+    """지연/실패 주입 설정 (에뮬레이터별로 env_prefix를 지정해서 사용)"""
+    LATENCY_MS: float = 50.0
+    LATENCY_SIGMA: float = 0.5
+    ERROR_RATE: float = 0.0
+    TIMEOUT_RATE: float = 0.0
+    TIMEOUT_SECONDS: float = 30.0
+    SEED: Optional[int] = None
+
+
+class FaultUpdate(BaseModel):
+    """PUT /_faults 요청 스키마 (보낸 항목만 변경)"""
+    LATENCY_MS: Optional[float] = None
+    LATENCY_SIGMA: Optional[float] = None
+    ERROR_RATE: Optional[float] = None
+    TIMEOUT_RATE: Optional[float] = None
+    TIMEOUT_SECONDS: Optional[float] = None
+
+
+class FaultInjector:
+    """요청마다 설정된 분포로 지연시키고 에러/타임아웃 여부를 결정"""
+
+    def __init__(self, settings: FaultSettings):
+        self.settings = settings
+        self._random = random.Random(settings.SEED)
+
+    def sample_latency(self) -> float:
+        """이번 요청의 지연 시간(초)"""
+        median = self.settings.LATENCY_MS / 1000
+        if median <= 0:
+            return 0.0
+        if self.settings.LATENCY_SIGMA <= 0:
+            return median
+        return self._random.lognormvariate(math.log(median), self.settings.LATENCY_SIGMA)
+
+    async def apply(self) -> bool:
+        """
+        지연(또는 타임아웃)을 적용
+
+        Returns:
+            True면 호출자가 에러 응답을 돌려줘야 함
+        """
+        if self._random.random() < self.settings.TIMEOUT_RATE:
+            await asyncio.sleep(self.settings.TIMEOUT_SECONDS)
+        else:
+            await asyncio.sleep(self.sample_latency())
+        return self._random.random() < self.settings.ERROR_RATE
+
+    def choice(self, options):
+        return self._random.choice(options)
+
+    def router(self) -> APIRouter:
+        """실행 중 설정 조회/변경 엔드포인트 (GET/PUT /_faults)"""
+        router = APIRouter()
+
+        @router.get("/_faults")
+        async def get_faults():
+            return self.settings.model_dump()
+
+        @router.put("/_faults")
+        async def update_faults(update: FaultUpdate):
+            for name, value in update.model_dump(exclude_none=True).items():
+                setattr(self.settings, name, value)
+            return self.settings.model_dump()
+
+        return router
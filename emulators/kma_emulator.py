@@ -0,0 +1,230 @@
+"""
+기상청 단기예보(getVilageFcst) 에뮬레이터
+
+임의의 격자(nx, ny)와 발표 시각에 대해 실제 응답과 같은 형식의 예보 항목을
+만들어 돌려준다. 같은 (격자, 발표 시각)에는 항상 같은 예보를 돌려주고,
+기온은 위도(ny)/계절/일교차를 반영하고 하늘상태/강수는 시간에 따라 이어지게 만든다.
+
+실행:
+    uvicorn emulators.kma_emulator:app --port 9001
+
+지연/실패 주입 환경변수: KMA_EMULATOR_LATENCY_MS, KMA_EMULATOR_ERROR_RATE 등
+"""
+import math
+import random
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+from pydantic_settings import SettingsConfigDict
+
+from emulators.faults import FaultInjector, FaultSettings
+
+
+class KMAEmulatorSettings(FaultSettings):
+    model_config = SettingsConfigDict(env_prefix="KMA_EMULATOR_")
+    LATENCY_MS: float = 80.0
+
+
+# 실제 응답의 시각별 카테고리 순서
+HOURLY_CATEGORIES = ("TMP", "UUU", "VVV", "VEC", "WSD", "SKY", "PTY", "POP", "WAV", "PCP", "REH", "SNO")
+
+# 기상청 발표 시각
+BASE_TIMES = ("0200", "0500", "0800", "1100", "1400", "1700", "2000", "2300")
+
+# 오류 응답 (resultCode, resultMsg)
+NO_DATA = ("03", "NO_DATA")
+INVALID_PARAMETER = ("10", "INVALID_REQUEST_PARAMETER_ERROR")
+LIMIT_EXCEEDED = ("22", "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR")
+
+AUTH_ERROR_XML = """<OpenAPI_ServiceResponse>
+    <cmmMsgHeader>
+        <errMsg>SERVICE ERROR</errMsg>
+        <returnAuthMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR</returnAuthMsg>
+        <returnReasonCode>30</returnReasonCode>
+    </cmmMsgHeader>
+</OpenAPI_ServiceResponse>"""
+
+
+faults = FaultInjector(KMAEmulatorSettings())
+
+app = FastAPI(title="KMA getVilageFcst Emulator")
+app.include_router(faults.router())
+
+
+@app.get("/getVilageFcst")
+async def get_vilage_fcst(
+    authKey: Optional[str] = None,
+    serviceKey: Optional[str] = None,
+    numOfRows: int = 10,
+    pageNo: int = 1,
+    dataType: str = "XML",
+    base_date: Optional[str] = None,
+    base_time: Optional[str] = None,
+    nx: Optional[int] = None,
+    ny: Optional[int] = None
+):
+    if await faults.apply():
+        return _injected_error()
+
+    if not (authKey or serviceKey):
+        return Response(AUTH_ERROR_XML, media_type="text/xml;charset=UTF-8")
+
+    if base_date is None or base_time not in BASE_TIMES or nx is None or ny is None:
+        return _error(INVALID_PARAMETER)
+    try:
+        datetime.strptime(base_date, "%Y%m%d")
+    except ValueError:
+        return _error(INVALID_PARAMETER)
+
+    items = generate_forecast(nx, ny, base_date, base_time)
+    page_items = items[(pageNo - 1) * numOfRows:pageNo * numOfRows]
+    if not page_items:
+        return _error(NO_DATA)
+
+    return JSONResponse({
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": page_items},
+                "pageNo": pageNo,
+                "numOfRows": numOfRows,
+                "totalCount": len(items),
+            },
+        }
+    })
+
+
+@lru_cache(maxsize=4096)
+def generate_forecast(nx: int, ny: int, base_date: str, base_time: str) -> List[Dict[str, Any]]:
+    """
+    발표 시각 1시간 뒤부터 발표일 +2일 23시까지의 시간별 예보 항목 생성
+
+    같은 격자/발표일에는 같은 날씨 흐름을 만들어서 발표 시각이 바뀌어도
+    예보 값이 크게 튀지 않게 한다.
+    """
+    rng = random.Random(zlib.crc32(f"{nx},{ny},{base_date}".encode()))
+    base = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    start = base + timedelta(hours=1)
+    end = datetime.strptime(base_date, "%Y%m%d") + timedelta(days=3)
+
+    # 위도(ny)와 계절에 따른 일평균 기온, 격자별 편차
+    month = base.month
+    seasonal = 13.0 - 13.0 * math.cos(2 * math.pi * (month - 0.5) / 12)
+    daily_mean = seasonal - (ny - 120) * 0.08 + rng.uniform(-2.0, 2.0)
+    daily_range = rng.uniform(6.0, 11.0)
+
+    # 하늘상태는 3시간 단위로 이어지는 마르코프 체인
+    hours = int((end - start).total_seconds() // 3600)
+    sky, wet = _weather_sequence(rng, (hours + 2) // 3 + 1)
+
+    items = []
+    daily_extremes: Dict[str, Tuple[float, float]] = {}
+    when = start
+    for offset in range(hours):
+        day_index = (when.date() - base.date()).days
+        temperature = _temperature(daily_mean + day_index * rng.uniform(-0.5, 0.5), daily_range, when.hour)
+        block = (offset + start.hour % 3) // 3
+        values = _hourly_values(rng, temperature, sky[block], wet[block])
+
+        fcst_date = when.strftime("%Y%m%d")
+        fcst_time = when.strftime("%H00")
+        for category in HOURLY_CATEGORIES:
+            items.append(_item(base_date, base_time, nx, ny, fcst_date, fcst_time, category, values[category]))
+
+        # 최저기온(0600), 최고기온(1500)
+        if when.hour in (6, 15):
+            low, high = daily_extremes.setdefault(
+                fcst_date,
+                (daily_mean - daily_range / 2, daily_mean + daily_range / 2)
+            )
+            category, value = ("TMN", low) if when.hour == 6 else ("TMX", high)
+            items.append(_item(base_date, base_time, nx, ny, fcst_date, fcst_time, category, f"{value:.1f}"))
+
+        when += timedelta(hours=1)
+
+    return items
+
+
+def _weather_sequence(rng: random.Random, blocks: int) -> Tuple[List[str], List[bool]]:
+    """3시간 블록별 (하늘상태 코드, 강수 여부)"""
+    transitions = {"1": (0.7, 0.25, 0.05), "3": (0.25, 0.5, 0.25), "4": (0.05, 0.35, 0.6)}
+    state = rng.choices(("1", "3", "4"), weights=(0.5, 0.3, 0.2))[0]
+    sky, wet = [], []
+    for _ in range(blocks):
+        state = rng.choices(("1", "3", "4"), weights=transitions[state])[0]
+        sky.append(state)
+        wet.append(state == "4" and rng.random() < 0.5)
+    return sky, wet
+
+
+def _temperature(mean: float, daily_range: float, hour: int) -> float:
+    """15시 최고, 03시 최저인 일교차 곡선"""
+    return mean + daily_range / 2 * math.cos(2 * math.pi * (hour - 15) / 24)
+
+
+def _hourly_values(rng: random.Random, temperature: float, sky: str, wet: bool) -> Dict[str, str]:
+    wind_speed = round(rng.uniform(0.5, 6.0), 1)
+    direction = rng.randrange(0, 360)
+    radians = math.radians(direction)
+
+    if wet:
+        rain_type = "3" if temperature < 0 else rng.choice(("1", "1", "4"))
+        pop = rng.randrange(60, 100, 10)
+        amount = rng.choice(("1mm 미만", "1.0mm", "2.0mm", "5.0mm"))
+        precipitation = "강수없음" if rain_type == "3" else amount
+        snow = rng.choice(("1cm 미만", "1.0cm")) if rain_type == "3" else "적설없음"
+        humidity = rng.randrange(80, 100, 5)
+    else:
+        rain_type = "0"
+        pop = {"1": rng.randrange(0, 20, 10), "3": rng.randrange(20, 40, 10), "4": rng.randrange(30, 60, 10)}[sky]
+        precipitation = "강수없음"
+        snow = "적설없음"
+        humidity = rng.randrange(35, 85, 5)
+
+    return {
+        "TMP": str(round(temperature)),
+        "UUU": f"{-wind_speed * math.sin(radians):.1f}",
+        "VVV": f"{-wind_speed * math.cos(radians):.1f}",
+        "VEC": str(direction),
+        "WSD": str(wind_speed),
+        "SKY": sky,
+        "PTY": rain_type,
+        "POP": str(pop),
+        "WAV": "0",
+        "PCP": precipitation,
+        "REH": str(humidity),
+        "SNO": snow,
+    }
+
+
+def _item(base_date, base_time, nx, ny, fcst_date, fcst_time, category, value) -> Dict[str, Any]:
+    return {
+        "baseDate": base_date,
+        "baseTime": base_time,
+        "category": category,
+        "fcstDate": fcst_date,
+        "fcstTime": fcst_time,
+        "fcstValue": value,
+        "nx": nx,
+        "ny": ny,
+    }
+
+
+def _error(result: Tuple[str, str]) -> JSONResponse:
+    code, message = result
+    return JSONResponse({"response": {"header": {"resultCode": code, "resultMsg": message}}})
+
+
+def _injected_error() -> Response:
+    """실제로 관찰되는 실패 형태 중 하나 (5xx, XML 인증 오류, 호출 한도 초과)"""
+    kind = faults.choice(("http", "xml", "limit"))
+    if kind == "http":
+        return Response("Bad Gateway", status_code=502)
+    if kind == "xml":
+        return Response(AUTH_ERROR_XML, media_type="text/xml;charset=UTF-8")
+    return _error(LIMIT_EXCEEDED)
@@ -0,0 +1,195 @@
+"""
+OpenAI Chat Completions 에뮬레이터
+
+POST /v1/chat/completions 요청의 마지막 사용자 메시지에서 날씨 값(기온, 강수 형태,
+강수 확률 등)을 읽어 서버가 기대하는 JSON 조언({"message", "checklist"})을
+돌려준다. usage 토큰 수는 글자 수로 근사하고, max_tokens를 넘으면 실제처럼
+응답을 자르고 finish_reason="length"로 표시한다. stream=true면 SSE 조각으로 보낸다.
+
+실행:
+    uvicorn emulators.openai_emulator:app --port 9002
+
+지연/실패 주입 환경변수: OPENAI_EMULATOR_LATENCY_MS(첫 토큰까지),
+OPENAI_EMULATOR_TOKEN_MS(출력 토큰당), OPENAI_EMULATOR_ERROR_RATE 등
+"""
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from pydantic_settings import SettingsConfigDict
+
+from emulators.faults import FaultInjector, FaultSettings
+
+
+class OpenAIEmulatorSettings(FaultSettings):
+    model_config = SettingsConfigDict(env_prefix="OPENAI_EMULATOR_")
+    LATENCY_MS: float = 400.0
+    TOKEN_MS: float = 15.0  # 출력 토큰 하나 생성에 걸리는 시간
+    CHARS_PER_TOKEN: float = 1.5  # 토큰 수 근사 (한국어 기준)
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: Optional[str] = None
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str
+    messages: List[ChatMessage]
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    stream: bool = False
+    response_format: Optional[Dict[str, Any]] = None
+
+
+# 주입되는 오류 (HTTP 상태, type, code, message)
+INJECTED_ERRORS = (
+    (429, "requests", "rate_limit_exceeded", "Rate limit reached for requests"),
+    (500, "server_error", None, "The server had an error while processing your request."),
+    (503, "server_error", None, "The engine is currently overloaded, please try again later"),
+)
+
+# 스트리밍 조각 하나의 글자 수
+STREAM_CHUNK_CHARS = 4
+
+
+settings = OpenAIEmulatorSettings()
+faults = FaultInjector(settings)
+
+app = FastAPI(title="OpenAI Chat Completions Emulator")
+app.include_router(faults.router())
+
+
+@app.post("/v1/chat/completions")
+async def create_chat_completion(request: ChatCompletionRequest):
+    if await faults.apply():
+        return _injected_error()
+
+    prompt = "\n".join(message.content or "" for message in request.messages)
+    user_prompt = next(
+        (message.content or "" for message in reversed(request.messages) if message.role == "user"),
+        ""
+    )
+    content = json.dumps(build_advice(parse_weather(user_prompt)), ensure_ascii=False)
+    content, finish_reason = _truncate(content, request.max_tokens)
+
+    prompt_tokens = _count_tokens(prompt)
+    completion_tokens = _count_tokens(content)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+
+    if request.stream:
+        return StreamingResponse(
+            _stream(completion_id, created, request.model, content, finish_reason),
+            media_type="text/event-stream"
+        )
+
+    await asyncio.sleep(completion_tokens * settings.TOKEN_MS / 1000)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": request.model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": finish_reason,
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def parse_weather(prompt: str) -> Dict[str, Any]:
+    """AIService._format_weather_info 형식의 날씨 줄에서 값 추출"""
+    def number(label: str) -> Optional[float]:
+        match = re.search(rf"{label}:\s*(-?\d+(?:\.\d+)?)", prompt)
+        return None if match is None else float(match.group(1))
+
+    rain_type = re.search(r"강수 형태:\s*(\S+)", prompt)
+    return {
+        "temperature": number("기온"),
+        "rain_probability": number("강수 확률"),
+        "wind_speed": number("풍속"),
+        "rain_type": None if rain_type is None else rain_type.group(1),
+    }
+
+
+def build_advice(weather: Dict[str, Any]) -> Dict[str, Any]:
+    """날씨 값에 맞는 반말 메시지와 체크리스트"""
+    temperature = weather["temperature"] if weather["temperature"] is not None else 15.0
+    rain_probability = weather["rain_probability"] or 0
+    rainy = weather["rain_type"] not in (None, "없음") or rain_probability >= 60
+
+    if temperature < 0:
+        message = "영하로 떨어졌어! 🥶 패딩이랑 목도리 단단히 챙겨."
+        checklist = ["두꺼운 패딩 입기", "목도리 착용", "장갑 챙기기", "핫팩 준비"]
+    elif temperature < 10:
+        message = "아침저녁으로 꽤 쌀쌀해. 따뜻한 외투 꼭 걸치고 나가!"
+        checklist = ["따뜻한 외투 입기", "얇은 목도리", "긴 바지 착용"]
+    elif temperature < 20:
+        message = "선선해서 걷기 좋은 날이야 😊 가벼운 겉옷 하나면 충분해."
+        checklist = ["가벼운 겉옷 챙기기", "편한 신발 신기", "물 한 병 준비"]
+    elif temperature < 28:
+        message = "따뜻하고 기분 좋은 날씨야! 반팔에 얇은 겉옷 정도면 딱이야."
+        checklist = ["반팔 착용", "얇은 겉옷 챙기기", "선크림 바르기"]
+    else:
+        message = "진짜 덥다 🌞 물 자주 마시고 그늘로 다녀!"
+        checklist = ["시원한 옷 입기", "물 충분히 챙기기", "선크림 바르기", "모자 쓰기"]
+
+    if rainy:
+        message += " 비 소식 있으니까 우산 꼭 챙겨 ☔"
+        checklist = ["우산 챙기기"] + checklist[:3] + ["방수 신발 신기"]
+    elif (weather["wind_speed"] or 0) >= 9:
+        message += " 바람도 세게 부니까 조심해."
+        checklist = checklist[:4] + ["바람막이 챙기기"]
+
+    return {"message": message, "checklist": checklist}
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, round(len(text) / settings.CHARS_PER_TOKEN))
+
+
+def _truncate(content: str, max_tokens: Optional[int]) -> Tuple[str, str]:
+    """max_tokens를 넘으면 잘라서 finish_reason="length"로 표시"""
+    if max_tokens is None or _count_tokens(content) <= max_tokens:
+        return content, "stop"
+    return content[:int(max_tokens * settings.CHARS_PER_TOKEN)], "length"
+
+
+async def _stream(completion_id: str, created: int, model: str, content: str, finish_reason: str):
+    def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        }
+        return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    delay = STREAM_CHUNK_CHARS / settings.CHARS_PER_TOKEN * settings.TOKEN_MS / 1000
+    for start in range(0, len(content), STREAM_CHUNK_CHARS):
+        await asyncio.sleep(delay)
+        yield chunk({"content": content[start:start + STREAM_CHUNK_CHARS]})
+    yield chunk({}, finish_reason)
+    yield "data: [DONE]\n\n"
+
+
+def _injected_error() -> JSONResponse:
+    status, error_type, code, message = faults.choice(INJECTED_ERRORS)
+    return JSONResponse(
+        {"error": {"message": message, "type": error_type, "param": None, "code": code}},
+        status_code=status
+    )
@@ -1,10 +1,17 @@
-from fastapi import FastAPI, HTTPException
+import logging
+import time
+import uuid
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.api.v1.endpoints.weather import weather_service, ai_service
 from app.core.database import engine, Base
+from app.core.logging import new_request_context, setup_logging, shutdown_logging
+from app.core.metrics import metrics
+from app.services.prewarm import ForecastPrewarmer
 from app.core.exceptions import (
     validation_exception_handler,
     http_exception_handler,
@@ -23,6 +30,11 @@ app = FastAPI(
     version="1.0.0"
 )
 
+access_logger = logging.getLogger("app.access")
+
+# 인기 격자 예보 프리워밍 작업
+forecast_prewarmer = ForecastPrewarmer(weather_service, ai_service)
+
 # 설정을 앱 상태에 저장 (에러 핸들러에서 DEBUG 모드 확인용)
 app.state.config = settings
 
@@ -35,6 +47,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_context_middleware(request: Request, call_next):
+    """
+    요청마다 요청 ID를 부여하고 요청 단위 로그 컨텍스트 설정
+    
+    클라이언트/프록시가 보낸 X-Request-ID가 있으면 그대로 사용하고,
+    응답 본문 전송이 끝나면 단계별 소요 시간을 포함한 접근 로그 한 줄을 남김
+    (SSE/NDJSON 스트리밍 응답도 스트림이 끝난 뒤 전체 시간과 OpenAI 단계를 기록)
+    """
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    new_request_context(request_id)
+    started = time.perf_counter()
+    
+    response = await call_next(request)
+    
+    response.headers["X-Request-ID"] = request_id
+    response.body_iterator = _log_access_after_body(
+        response.body_iterator, request, response.status_code, started
+    )
+    return response
+
+
+async def _log_access_after_body(body_iterator, request: Request, status_code: int, started: float):
+    """본문을 그대로 전달하고, 전송이 끝나거나 클라이언트가 끊으면 접근 로그 기록"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        access_logger.info(
+            "%s %s %d",
+            request.method,
+            request.url.path,
+            status_code,
+            extra={"duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+        )
+
+
 # 글로벌 에러 핸들러 등록
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -47,9 +96,34 @@ app.add_exception_handler(Exception, general_exception_handler)
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작시 실행"""
+    # 큐 기반 JSON 로깅 (출력은 백그라운드 스레드에서)
+    setup_logging()
+    
     # 데이터베이스 테이블 생성 (개발용 - 프로덕션에서는 Alembic 사용)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    
+    # 기상청 API 공용 HTTP 클라이언트 생성 (커넥션 재사용)
+    await weather_service.start()
+    
+    # 공유 조언 저장소의 만료 조언 주기적 정리
+    if ai_service.advice_store is not None:
+        ai_service.advice_store.start()
+    
+    # 발표 직후 인기 격자 예보 프리워밍 (+ 시그니처별 조언 사전 생성)
+    if settings.PREWARM_ENABLED:
+        forecast_prewarmer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료시 실행"""
+    await forecast_prewarmer.stop()
+    if ai_service.advice_store is not None:
+        await ai_service.advice_store.stop()
+    await weather_service.close()
+    # 다른 종료 작업의 로그까지 출력되도록 마지막에 정리
+    shutdown_logging()
 
 
 # API 라우터 포함 (프리픽스 없음)
@@ -68,3 +142,9 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """캐시/프리워밍 등 프로세스 내 메트릭 조회"""
+    return metrics.snapshot()
@@ -0,0 +1,384 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_service import AIService, weather_signature
+
+
+WEATHER = {
+    "temperature": 5.0,
+    "sky_condition": "맑음",
+    "rain_type": "없음",
+    "rain_probability": 10,
+    "humidity": 45,
+    "wind_speed": 3.5,
+}
+
+
+class FakeCompletions:
+    """chat.completions.create 대역 (호출 횟수/프롬프트 기록)"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        content = json.dumps({
+            "message": "오늘 좀 쌀쌀해! 🧥 외투 챙겨.",
+            "checklist": ["외투 챙기기", "목도리 착용"],
+        }, ensure_ascii=False)
+        if kwargs.get("stream"):
+            return self._stream(json.dumps(json.loads(content)))  # \uXXXX 이스케이프 포함
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+            usage=SimpleNamespace(prompt_tokens=500, completion_tokens=60, total_tokens=560),
+            model="gpt-4o-mini",
+        )
+
+
+    async def _stream(self, content: str):
+        for start in range(0, len(content), 3):
+            delta = SimpleNamespace(content=content[start:start + 3])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=None)])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None), finish_reason="stop")])
+
+
+def make_service(delay: float = 0.0):
+    service = AIService()
+    completions = FakeCompletions(delay)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service, completions
+
+
+def test_weather_signature_quantizes_values():
+    """가까운 날씨 값은 같은 시그니처"""
+    similar = dict(WEATHER, temperature=4.2, rain_probability=15, humidity=50)
+    different = dict(WEATHER, rain_type="비")
+
+    assert weather_signature(WEATHER) == weather_signature(similar)
+    assert weather_signature(WEATHER) != weather_signature(different)
+
+
+@pytest.mark.asyncio
+async def test_advice_cached_per_signature():
+    """같은 시그니처는 GPT를 한 번만 호출"""
+    service, completions = make_service()
+
+    first = await service.generate_weather_advice(WEATHER)
+    second = await service.generate_weather_advice(dict(WEATHER, temperature=4.5))
+
+    assert len(completions.calls) == 1
+    assert first == second
+    assert service._advice_cache.stats()["hits"] == 1
+
+
+def test_personalize_message_vocative():
+    from app.services.ai_service import personalize_message
+
+    assert personalize_message("우산 챙겨!", "민준") == "민준아, 우산 챙겨!"
+    assert personalize_message("우산 챙겨!", "철수") == "철수야, 우산 챙겨!"
+    assert personalize_message("우산 챙겨!", "Alex") == "Alex, 우산 챙겨!"
+    assert personalize_message("우산 챙겨!", "사용자") == "우산 챙겨!"
+
+
+@pytest.mark.asyncio
+async def test_advice_shared_across_users():
+    """GPT 요청에는 이름이 없고, 같은 날씨면 다른 사용자도 같은 조언 공유"""
+    service, completions = make_service()
+
+    first = await service.generate_weather_advice(WEATHER, user_name="민준")
+    second = await service.generate_weather_advice(WEATHER, user_name="철수")
+
+    assert len(completions.calls) == 1
+    assert "민준" not in json.dumps(completions.calls[0]["messages"], ensure_ascii=False)
+    assert first["message"].startswith("민준아, ")
+    assert second["message"].startswith("철수야, ")
+    assert first["checklist"] == second["checklist"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_call():
+    """동시에 들어온 같은 프롬프트는 GPT 호출 한 번을 공유하고, 대기자 취소에 영향 없음"""
+    service, completions = make_service(delay=0.02)
+
+    cancelled = asyncio.ensure_future(service.generate_weather_advice(WEATHER, user_name="민준"))
+    others = [
+        asyncio.ensure_future(service.generate_weather_advice(WEATHER, user_name="철수"))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    results = await asyncio.gather(*others)
+
+    assert len(completions.calls) == 1
+    assert all(result["checklist"] == ["외투 챙기기", "목도리 착용"] for result in results)
+
+
+def test_message_stream_extractor_handles_split_escapes():
+    """조각 경계에서 잘린 이스케이프도 올바르게 이어 붙임"""
+    from app.services.ai_service import MessageStreamExtractor
+
+    content = json.dumps({"message": "비 와 ☔ \"우산\" 챙겨", "checklist": ["우산"]})
+    extractor = MessageStreamExtractor()
+    text = "".join(extractor.feed(content[i:i + 2]) for i in range(0, len(content), 2))
+
+    assert text == '비 와 ☔ "우산" 챙겨'
+    assert extractor.done
+
+
+@pytest.mark.asyncio
+async def test_stream_weather_advice_events():
+    """호칭 → 메시지 조각 → 체크리스트 → done 순서로 전달"""
+    service, completions = make_service()
+    untracked = service._stream_untracked.value
+
+    events = [event async for event in service.stream_weather_advice(WEATHER, user_name="민준")]
+    assert service._stream_untracked.value == untracked + 1  # usage 없는 스트리밍 호출
+
+    messages = "".join(data for event, data in events if event == "message")
+    assert messages == "민준아, 오늘 좀 쌀쌀해! 🧥 외투 챙겨."
+    assert events[-2] == ("checklist", ["외투 챙기기", "목도리 착용"])
+    assert events[-1] == ("done", {"message": messages, "checklist": ["외투 챙기기", "목도리 착용"]})
+    assert completions.calls[0]["stream"] is True
+
+    # 스트리밍 결과도 캐시되어 일반 요청이 재사용
+    await service.generate_weather_advice(WEATHER)
+    assert len(completions.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_releases_limiter_slot_before_client_finishes():
+    """느린 클라이언트가 읽는 동안에도 GPT 스트림을 다 읽으면 리미터 슬롯 반납"""
+    from app.core.limiter import ConcurrencyLimiter
+
+    service, completions = make_service()
+    service._limiter = ConcurrencyLimiter("test_openai_stream", limit=1, max_queue=10)
+
+    events = service.stream_weather_advice(WEATHER)
+    assert (await events.__anext__())[0] == "message"
+    await asyncio.sleep(0.01)  # 클라이언트는 아직 나머지 이벤트를 읽지 않음
+    assert service._limiter.active == 0
+
+    remaining = [event async for event in events]
+    assert remaining[-1][0] == "done"
+
+    # 클라이언트가 중간에 끊으면 스트림 읽기도 취소되어 슬롯 반납
+    service._advice_cache.clear()
+    events = service.stream_weather_advice(WEATHER)
+    await events.__anext__()
+    await events.aclose()
+    await asyncio.sleep(0)
+    assert service._limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_pregenerate_advice_dedupes_and_carries_over():
+    """시그니처별로 한 번만 생성하고, 다음 슬롯에서 같은 시그니처는 GPT 없이 재사용"""
+    service, completions = make_service()
+    rainy = dict(WEATHER, rain_type="비", rain_probability=80)
+
+    first = await service.pregenerate_advice([WEATHER, dict(WEATHER, temperature=4.0), rainy])
+    assert first == {"signatures": 2, "cached": 0, "carried_over": 0, "generated": 2, "fallback": 0}
+    assert len(completions.calls) == 2
+
+    # 다음 슬롯: 슬롯 캐시는 비었지만 시그니처가 같으면 이어서 사용
+    service._advice_cache.clear()
+    second = await service.pregenerate_advice([WEATHER, rainy])
+    assert second == {"signatures": 2, "cached": 0, "carried_over": 2, "generated": 0, "fallback": 0}
+    assert len(completions.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_pregenerate_advice_counts_fallbacks_separately():
+    """GPT 대신 폴백이 된 시그니처는 generated가 아니라 fallback으로 집계"""
+    service, completions = make_service()
+
+    async def failing_create(**kwargs):
+        raise RuntimeError("upstream down")
+
+    completions.create = failing_create
+    fallbacks = service._pregen_fallbacks.value
+
+    result = await service.pregenerate_advice([WEATHER])
+
+    assert result == {"signatures": 1, "cached": 0, "carried_over": 0, "generated": 0, "fallback": 1}
+    assert service._pregen_fallbacks.value == fallbacks + 1
+
+
+@pytest.mark.asyncio
+async def test_overloaded_requests_fall_back_without_waiting(monkeypatch):
+    """대기 예산 안에 차례가 오지 않으면 바로 규칙 기반 폴백"""
+    from app.core.config import settings
+    from app.core.limiter import ConcurrencyLimiter
+
+    monkeypatch.setattr(settings, "OPENAI_QUEUE_TIMEOUT_SECONDS", 0.01)
+    service, completions = make_service(delay=0.2)
+    service._limiter = ConcurrencyLimiter("test_openai", limit=1, max_queue=10)
+
+    slow, overloaded = await asyncio.gather(
+        service.generate_weather_advice(WEATHER),
+        service.generate_weather_advice(dict(WEATHER, temperature=30.0)),
+    )
+
+    assert len(completions.calls) == 1
+    assert slow["checklist"] == ["외투 챙기기", "목도리 착용"]
+    assert overloaded == service._generate_fallback_advice(dict(WEATHER, temperature=30.0))
+
+
+@pytest.mark.asyncio
+async def test_hedged_advice_returns_fallback_then_upgrade():
+    """예산 안에 GPT가 없으면 폴백 + advice_id, 완료 후 advice_id로 GPT 조언 조회"""
+    service, completions = make_service(delay=0.05)
+
+    advice, advice_id = await service.generate_weather_advice_hedged(
+        WEATHER, user_name="민준", budget_ms=5
+    )
+
+    assert advice_id is not None
+    assert advice["message"].startswith("민준아, ")
+    assert await service.get_upgraded_advice(advice_id) == {"status": "pending"}
+
+    await asyncio.sleep(0.1)
+    assert await service.get_upgraded_advice(advice_id) == {
+        "status": "ready",
+        "message": "민준아, 오늘 좀 쌀쌀해! 🧥 외투 챙겨.",
+        "checklist": ["외투 챙기기", "목도리 착용"],
+    }
+
+    # 캐시된 뒤에는 예산 안에 GPT 조언을 바로 반환
+    advice, advice_id = await service.generate_weather_advice_hedged(WEATHER, budget_ms=5)
+    assert advice_id is None
+
+
+@pytest.mark.asyncio
+async def test_usage_recorded_per_call(caplog):
+    """OpenAI 호출마다 토큰/지연 시간을 집계하고 구조화 로그를 남김"""
+    service, completions = make_service()
+    prompt_tokens = service._tokens["prompt"].value
+    latency_count = service._latency.count
+
+    with caplog.at_level("INFO", logger="app.openai.usage"):
+        await service.generate_weather_advice(WEATHER)
+        await service.generate_weather_advice(WEATHER)
+
+    assert service._tokens["prompt"].value - prompt_tokens == 500
+    assert service._latency.count - latency_count == 1
+
+    records = caplog.records
+    assert [record.cache for record in records] == ["miss", "hit"]
+    assert records[0].total_tokens == 560
+    assert records[0].model == "gpt-4o-mini"
+    assert records[0].finish_reason == "stop"
+    assert records[0].fallback is None
+    assert records[1].total_tokens is None
+
+
+class FakeAdviceStore:
+    """AdviceStore 대역 (실패 모드 지원)"""
+
+    def __init__(self, fail: bool = False):
+        self.rows = {}
+        self.upgrades = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            return None  # AdviceStore는 DB 오류시 None을 반환
+        return self.rows.get(key)
+
+    async def put(self, key, advice_data, ttl, model=None):
+        if self.fail:
+            return False
+        self.rows[key] = advice_data
+        return True
+
+    async def get_upgrade(self, advice_id):
+        return None if self.fail else self.upgrades.get(advice_id)
+
+    async def put_upgrade(self, advice_id, upgrade, ttl):
+        if self.fail:
+            return False
+        self.upgrades[advice_id] = upgrade
+        return True
+
+    async def delete_upgrade(self, advice_id):
+        self.upgrades.pop(advice_id, None)
+        return not self.fail
+
+
+@pytest.mark.asyncio
+async def test_advice_store_shared_between_workers():
+    """다른 워커가 저장소에 남긴 조언은 GPT 없이 재사용"""
+    store = FakeAdviceStore()
+    first, first_completions = make_service()
+    second, second_completions = make_service()
+    first.advice_store = second.advice_store = store
+
+    advice = await first.generate_weather_advice(WEATHER)
+    await asyncio.sleep(0)  # 백그라운드 저장 완료 대기
+
+    assert len(store.rows) == 1
+    assert await second.generate_weather_advice(WEATHER) == advice
+    assert len(first_completions.calls) == 1
+    assert second_completions.calls == []
+
+
+@pytest.mark.asyncio
+async def test_advice_store_failure_falls_through_to_gpt():
+    """저장소 오류시 GPT 경로로 정상 응답"""
+    service, completions = make_service()
+    service.advice_store = FakeAdviceStore(fail=True)
+
+    advice = await service.generate_weather_advice(WEATHER)
+
+    assert len(completions.calls) == 1
+    assert advice["message"] == "오늘 좀 쌀쌀해! 🧥 외투 챙겨."
+
+
+@pytest.mark.asyncio
+async def test_hedged_upgrade_visible_from_other_worker():
+    """지연 응답 모드의 교체 조언은 다른 워커에서도 advice_id로 조회"""
+    store = FakeAdviceStore()
+    first, _ = make_service(delay=0.05)
+    second, second_completions = make_service()
+    first.advice_store = second.advice_store = store
+
+    _, advice_id = await first.generate_weather_advice_hedged(
+        WEATHER, user_name="민준", budget_ms=5
+    )
+    await asyncio.sleep(0)  # 백그라운드 저장 시작
+
+    assert await second.get_upgraded_advice(advice_id) == {"status": "pending"}
+
+    await asyncio.sleep(0.1)
+    assert await second.get_upgraded_advice(advice_id) == {
+        "status": "ready",
+        "message": "민준아, 오늘 좀 쌀쌀해! 🧥 외투 챙겨.",
+        "checklist": ["외투 챙기기", "목도리 착용"],
+    }
+    assert await second.get_upgraded_advice("unknown") is None
+    assert second_completions.calls == []
+
+
+@pytest.mark.asyncio
+async def test_hedged_upgrade_dropped_when_gpt_falls_back():
+    """이어진 GPT 호출도 실패하면 폴백을 ready로 올리지 않고 advice_id를 지움"""
+    service, completions = make_service()
+    service.advice_store = store = FakeAdviceStore()
+
+    async def failing_create(**kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    completions.create = failing_create
+    _, advice_id = await service.generate_weather_advice_hedged(WEATHER, budget_ms=5)
+    await asyncio.sleep(0)
+    assert await service.get_upgraded_advice(advice_id) == {"status": "pending"}
+
+    await asyncio.sleep(0.1)
+    assert await service.get_upgraded_advice(advice_id) is None
+    assert advice_id not in store.upgrades
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.singleflight import SingleFlight
+from app.services.weather_service import get_base_datetime, get_next_base_datetime
+
+
+def test_ttl_cache_lru_eviction():
+    """최대 크기 초과시 가장 오래 사용하지 않은 항목 제거"""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1  # a를 최근 사용으로 갱신
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_expiry(monkeypatch):
+    """만료된 항목은 miss 처리"""
+    cache = TTLCache(maxsize=10)
+    cache.set("a", 1, ttl=10)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_base_datetime_follows_kma_schedule(monkeypatch):
+    """발표분 제공 시각(발표 + 10분) 기준 base_date/base_time 계산"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "KMA_PUBLISH_DELAY_SECONDS", 600.0)
+    monkeypatch.setattr(settings, "PREWARM_ENABLED", False)
+    assert get_base_datetime(datetime(2024, 3, 1, 1, 30)) == ("20240229", "2300")
+    assert get_base_datetime(datetime(2024, 3, 1, 2, 0)) == ("20240229", "2300")
+    assert get_base_datetime(datetime(2024, 3, 1, 2, 9, 59)) == ("20240229", "2300")
+    assert get_base_datetime(datetime(2024, 3, 1, 2, 10)) == ("20240301", "0200")
+    assert get_base_datetime(datetime(2024, 3, 1, 13, 59)) == ("20240301", "1100")
+    assert get_base_datetime(datetime(2024, 3, 1, 23, 5)) == ("20240301", "2000")
+    assert get_base_datetime(datetime(2024, 3, 2, 0, 5)) == ("20240301", "2300")
+
+
+def test_next_base_datetime(monkeypatch):
+    """다음 발표분 제공 시각 계산 (캐시 만료 시각)"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "KMA_PUBLISH_DELAY_SECONDS", 600.0)
+    monkeypatch.setattr(settings, "PREWARM_ENABLED", False)
+    assert get_next_base_datetime(datetime(2024, 3, 1, 1, 30)) == datetime(2024, 3, 1, 2, 10)
+    assert get_next_base_datetime(datetime(2024, 3, 1, 11, 0)) == datetime(2024, 3, 1, 11, 10)
+    assert get_next_base_datetime(datetime(2024, 3, 1, 11, 10)) == datetime(2024, 3, 1, 14, 10)
+    assert get_next_base_datetime(datetime(2024, 3, 1, 23, 10)) == datetime(2024, 3, 2, 2, 10)
+    assert get_next_base_datetime(datetime(2024, 3, 2, 0, 5)) == datetime(2024, 3, 2, 2, 10)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """동시 호출은 한 번만 실행되고 결과를 공유"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "forecast"
+
+    results = await asyncio.gather(*(flight.do("cell", fetch) for _ in range(10)))
+
+    assert results == ["forecast"] * 10
+    assert calls == 1
+    assert flight.stats() == {"inflight": 0, "leaders": 1, "followers": 9}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors():
+    """실패시 기다리던 모든 호출자에게 예외 전달"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        *(flight.do("cell", fetch) for _ in range(3)),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_waiter_cancel_keeps_shared_call():
+    """대기자 하나가 취소되어도 공유 작업은 계속 실행"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("cell", fetch))
+    second = asyncio.ensure_future(flight.do("cell", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+
+
+def test_popularity_tracker_ranks_and_bounds():
+    """요청 빈도 순위 유지 및 최대 크기 제한"""
+    from app.core.popularity import PopularityTracker
+
+    tracker = PopularityTracker(maxsize=10, half_life=3600)
+    for _ in range(5):
+        tracker.record((60, 127))
+    for _ in range(3):
+        tracker.record((98, 76))
+    for i in range(20):
+        tracker.record((i, i))
+
+    assert tracker.top(2) == [(60, 127), (98, 76)]
+    assert len(tracker) <= 10
+
+
+def test_slot_switch_waits_for_prewarm_lead(monkeypatch):
+    """프리워밍을 켜면 제공 시각 + 리드 뒤에 전환하고, 미리 받은 슬롯은 그 슬롯 끝까지 캐시"""
+    from app.core.config import settings
+    from app.services.weather_service import get_slot_expiry
+
+    monkeypatch.setattr(settings, "KMA_PUBLISH_DELAY_SECONDS", 600.0)
+    monkeypatch.setattr(settings, "PREWARM_ENABLED", True)
+    monkeypatch.setattr(settings, "PREWARM_LEAD_SECONDS", 300.0)
+    assert get_base_datetime(datetime(2024, 3, 1, 11, 12)) == ("20240301", "0800")
+    assert get_base_datetime(datetime(2024, 3, 1, 11, 15)) == ("20240301", "1100")
+    assert get_next_base_datetime(datetime(2024, 3, 1, 11, 12)) == datetime(2024, 3, 1, 11, 15)
+    assert get_slot_expiry("20240301", "1100") == datetime(2024, 3, 1, 14, 15)
+    assert get_slot_expiry("20240301", "2300") == datetime(2024, 3, 2, 2, 15)
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.database import InstrumentedAsyncPool, engine, pool_stats
+from app.core.config import settings
+
+
+def test_engine_uses_pool_settings():
+    assert isinstance(engine.pool, InstrumentedAsyncPool)
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.echo == settings.DB_ECHO
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkout_wait_and_overflow():
+    """체크아웃마다 대기 시간을 기록하고, 한도를 넘으면 타임아웃을 집계"""
+    pool = InstrumentedAsyncPool(MagicMock, pool_size=1, max_overflow=1, timeout=0.01)
+    checkouts = pool.checkout_wait.count
+    timeouts = pool.timeouts.value
+
+    # 비동기 엔진과 같이 greenlet 안에서 체크아웃
+    first = await greenlet_spawn(pool.connect)
+    second = await greenlet_spawn(pool.connect)
+    assert pool_stats(pool)["checked_out"] == 2
+    assert pool_stats(pool)["overflow"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        await greenlet_spawn(pool.connect)
+
+    assert pool.checkout_wait.count - checkouts == 3
+    assert pool.timeouts.value - timeouts == 1
+
+    await greenlet_spawn(first.close)
+    await greenlet_spawn(second.close)
+    assert pool_stats(pool)["checked_out"] == 0
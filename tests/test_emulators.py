@@ -0,0 +1,112 @@
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from app.services.ai_service import AIService
+from app.services.weather_service import WeatherService
+from emulators import kma_emulator, openai_emulator
+
+
+@pytest.fixture(autouse=True)
+def no_latency(monkeypatch):
+    """테스트에서는 지연/실패 주입 없이 실행"""
+    for module in (kma_emulator, openai_emulator):
+        monkeypatch.setattr(module.faults.settings, "LATENCY_MS", 0.0)
+        monkeypatch.setattr(module.faults.settings, "ERROR_RATE", 0.0)
+    monkeypatch.setattr(openai_emulator.settings, "TOKEN_MS", 0.0)
+
+
+def make_weather_service():
+    service = WeatherService()
+    service.api_key = "test"
+    service.base_url = "http://kma/getVilageFcst"
+    service._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=kma_emulator.app))
+    return service
+
+
+def make_ai_service():
+    service = AIService()
+    service.client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://openai/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=openai_emulator.app))
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_weather_service_against_kma_emulator(monkeypatch):
+    """에뮬레이터 예보를 여러 페이지에 걸쳐 받아 weather_info로 변환"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "KMA_NUM_OF_ROWS", 100)
+    service = make_weather_service()
+
+    weather = await service.get_weather_forecast(37.5665, 126.9780)
+
+    assert weather["stale"] is False
+    assert weather["sky_condition"] in ("맑음", "구름많음", "흐림")
+    assert isinstance(weather["temperature"], float)
+    assert 0 <= weather["rain_probability"] <= 100
+
+
+def test_kma_emulator_is_deterministic_per_slot():
+    first = kma_emulator.generate_forecast(60, 127, "20260115", "0500")
+    again = kma_emulator.generate_forecast.__wrapped__(60, 127, "20260115", "0500")
+
+    assert first == again
+    assert {item["category"] for item in first} >= set(kma_emulator.HOURLY_CATEGORIES) | {"TMN", "TMX"}
+
+
+@pytest.mark.asyncio
+async def test_kma_emulator_injected_errors_are_detected(monkeypatch):
+    """주입된 오류는 서비스에서 실패로 처리되어 더미 데이터로 응답"""
+    monkeypatch.setattr(kma_emulator.faults.settings, "ERROR_RATE", 1.0)
+    service = make_weather_service()
+
+    weather = await service.get_weather_forecast(37.5665, 126.9780)
+
+    assert weather["fallback"] is True
+    assert weather["stale"] is True
+    assert weather["temperature"] == 15.0  # 더미 데이터
+
+
+@pytest.mark.asyncio
+async def test_ai_service_against_openai_emulator():
+    """에뮬레이터 응답으로 GPT 경로(토큰 집계 포함)를 그대로 통과"""
+    service = make_ai_service()
+    prompt_tokens = service._tokens["prompt"].value
+
+    advice = await service.generate_weather_advice(
+        {"temperature": -3.0, "sky_condition": "흐림", "rain_type": "눈", "rain_probability": 80},
+        user_name="민준"
+    )
+
+    assert advice["message"].startswith("민준아, 영하로 떨어졌어!")
+    assert advice["checklist"][0] == "우산 챙기기"
+    assert service._tokens["prompt"].value > prompt_tokens
+
+
+@pytest.mark.asyncio
+async def test_ai_service_streams_from_openai_emulator():
+    service = make_ai_service()
+
+    events = [event async for event in service.stream_weather_advice({"temperature": 22.0})]
+
+    assert events[-1][0] == "done"
+    message = "".join(data for event, data in events if event == "message")
+    assert message == events[-1][1]["message"]
+    assert message.startswith("따뜻하고 기분 좋은 날씨야!")
+
+
+@pytest.mark.asyncio
+async def test_openai_emulator_errors_fall_back(monkeypatch):
+    monkeypatch.setattr(openai_emulator.faults.settings, "ERROR_RATE", 1.0)
+    service = make_ai_service()
+    errors = service._fallbacks["error"].value
+
+    advice = await service.generate_weather_advice({"temperature": 22.0})
+
+    assert advice == service._generate_fallback_advice({"temperature": 22.0})
+    assert service._fallbacks["error"].value == errors + 1
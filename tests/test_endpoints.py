@@ -0,0 +1,245 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import weather
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeSession:
+    """AsyncSession 대역 (execute 호출 횟수 기록)"""
+
+    def __init__(self, users):
+        self.users = users
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        user_id = statement.whereclause.right.value
+        return FakeResult(self.users.get(user_id))
+
+    def add(self, user):
+        user.id = 99
+        user.is_active = True
+        self.users[user.id] = user
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, user):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    weather.user_cache.clear()
+    yield
+    weather.user_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_user_lookup_cached():
+    """같은 사용자는 DB를 한 번만 조회"""
+    db = FakeSession({1: SimpleNamespace(username="민준", is_active=True)})
+
+    first = await weather._get_user_or_404(db, 1)
+    second = await weather._get_user_or_404(db, 1)
+
+    assert first == second == weather.CachedUser("민준", True)
+    assert db.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_user_negative_cached():
+    """없는 사용자도 캐시해서 반복 요청에 DB를 조회하지 않음"""
+    db = FakeSession({})
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            await weather._get_user_or_404(db, 99)
+        assert error.value.status_code == 404
+
+    assert db.queries == 1
+
+    # 생성하면 음성 캐시 제거
+    await weather.create_user(weather.UserCreate(username="철수", email="cs@example.com"), db)
+    assert (await weather._get_user_or_404(db, 99)).username == "철수"
+
+
+@pytest.mark.asyncio
+async def test_inactive_user_not_found():
+    """비활성 사용자는 없는 사용자처럼 404 (캐시된 뒤에도)"""
+    db = FakeSession({1: SimpleNamespace(username="민준", is_active=False)})
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            await weather._get_user_or_404(db, 1)
+        assert error.value.status_code == 404
+
+    assert db.queries == 1
+
+    # 일괄 조회에서는 비활성 사용자를 결과에서 제외
+    session = InQuerySession({2: "철수", 3: "영희"}, inactive={3})
+    assert await weather._get_users(session, [2, 3]) == {2: weather.CachedUser("철수", True)}
+    weather.user_cache.pop(2)
+    assert await weather._get_users(session, [2, 3]) == {2: weather.CachedUser("철수", True)}
+    assert session.queried == [[2, 3], [2]]
+
+
+@pytest.mark.asyncio
+async def test_user_and_weather_fetched_concurrently(monkeypatch):
+    """예보 조회는 사용자 확인과 동시에 시작하고, 사용자가 없으면 취소"""
+    events = []
+
+    async def fake_forecast(lat, lon):
+        events.append("forecast_started")
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            events.append("forecast_cancelled")
+            raise
+        return {"temperature": 5.0}
+
+    class SlowSession(FakeSession):
+        async def execute(self, statement):
+            events.append("user_query")
+            await asyncio.sleep(0.01)
+            return await super().execute(statement)
+
+    monkeypatch.setattr(weather.weather_service, "get_weather_forecast", fake_forecast)
+    request = weather.WeatherAdviceRequest(user_id=1, latitude=37.5, longitude=127.0)
+
+    db = SlowSession({1: SimpleNamespace(username="민준", is_active=True)})
+    user, weather_data = await weather._get_user_and_weather(db, request)
+    assert user.username == "민준"
+    assert weather_data == {"temperature": 5.0}
+    assert events[:2] == ["user_query", "forecast_started"]
+
+    events.clear()
+    weather.user_cache.clear()
+    with pytest.raises(HTTPException):
+        await weather._get_user_and_weather(SlowSession({}), request)
+    assert events == ["user_query", "forecast_started", "forecast_cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_stream_cancels_weather_fetch_when_stream_never_starts(monkeypatch):
+    """스트림을 시작하기 전에 응답이 끝나면(클라이언트 끊김) 예보 조회 작업 취소"""
+    cancelled = []
+
+    async def fake_forecast(lat, lon):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return {"temperature": 5.0}
+
+    monkeypatch.setattr(weather.weather_service, "get_weather_forecast", fake_forecast)
+    request = weather.WeatherAdviceRequest(user_id=1, latitude=37.5, longitude=127.0)
+    db = FakeSession({1: SimpleNamespace(username="민준", is_active=True)})
+
+    response = await weather.stream_weather_advice(request, db)
+    await asyncio.sleep(0)  # 예보 조회 시작
+    await response.background()
+
+    assert cancelled == [True]
+
+
+class InQuerySession:
+    """IN (...) 조회 대역 (쿼리 횟수와 조회한 id 기록)"""
+
+    def __init__(self, users, inactive=()):
+        self.users = users
+        self.inactive = set(inactive)
+        self.queried = []
+
+    async def execute(self, statement):
+        ids = statement.whereclause.right.value
+        self.queried.append(sorted(ids))
+        return [
+            SimpleNamespace(id=user_id, username=self.users[user_id], is_active=user_id not in self.inactive)
+            for user_id in ids if user_id in self.users
+        ]
+
+
+@pytest.mark.asyncio
+async def test_batch_advice_dedupes_cells_and_signatures(monkeypatch):
+    """격자별 예보 1회, 시그니처별 조언 1회, 없는 사용자는 항목별 404"""
+    forecast_calls = []
+    advice_calls = []
+
+    async def fake_forecast(nx, ny, target_time=None):
+        forecast_calls.append((nx, ny))
+        return {"temperature": 5.0, "sky_condition": "맑음"}
+
+    async def fake_advice(weather_data, user_name="사용자"):
+        advice_calls.append(weather_data)
+        await asyncio.sleep(0.01)
+        return {"message": "외투 챙겨.", "checklist": ["외투 챙기기"]}
+
+    monkeypatch.setattr(weather.weather_service, "get_grid_forecast", fake_forecast)
+    monkeypatch.setattr(weather.ai_service, "generate_weather_advice", fake_advice)
+
+    seoul = {"latitude": 37.5665, "longitude": 126.9780}
+    busan = {"latitude": 35.1796, "longitude": 129.0756}
+    request = weather.WeatherAdviceBatchRequest(items=[
+        {"user_id": 1, **seoul},
+        {"user_id": 2, **seoul},
+        {"user_id": 3, **busan},
+        {"user_id": 4, **busan},
+    ])
+    db = InQuerySession({1: "민준", 2: "철수", 3: "영희"})
+
+    response = await weather.get_weather_advice_batch(request, db)
+    results = response.results
+
+    assert db.queried == [[1, 2, 3, 4]]
+    assert sorted(forecast_calls) == [(60, 127), (98, 76)]
+    assert len(advice_calls) == 1
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert results[0].message == "민준아, 외투 챙겨."
+    assert results[1].message == "철수야, 외투 챙겨."
+    assert results[3].status == 404 and results[3].message is None
+
+
+@pytest.mark.asyncio
+async def test_batch_advice_streams_ndjson(monkeypatch):
+    async def fake_forecast(nx, ny, target_time=None):
+        return {"temperature": 5.0}
+
+    async def fake_advice(weather_data, user_name="사용자"):
+        return {"message": "외투 챙겨.", "checklist": []}
+
+    monkeypatch.setattr(weather.weather_service, "get_grid_forecast", fake_forecast)
+    monkeypatch.setattr(weather.ai_service, "generate_weather_advice", fake_advice)
+    request = weather.WeatherAdviceBatchRequest(
+        items=[{"user_id": 1, "latitude": 37.5665, "longitude": 126.9780}],
+        stream=True
+    )
+
+    response = await weather.get_weather_advice_batch(request, InQuerySession({1: "민준"}))
+    lines = [line async for line in response.body_iterator]
+
+    assert response.media_type == "application/x-ndjson"
+    assert [json.loads(line)["message"] for line in lines] == ["민준아, 외투 챙겨."]
+
+
+def test_batch_request_rejects_too_many_items():
+    """최대 항목 수 초과는 스키마 검증에서 거름"""
+    from pydantic import ValidationError
+    from app.core.config import settings
+
+    item = {"user_id": 1, "latitude": 37.5665, "longitude": 126.9780}
+    with pytest.raises(ValidationError, match="too_long|at most"):
+        weather.WeatherAdviceBatchRequest(items=[item] * (settings.ADVICE_BATCH_MAX_ITEMS + 1))
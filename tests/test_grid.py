@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+
+from app.services.grid import latlon_to_grid, latlon_to_grid_batch
+
+
+def _reference_convert(lat, lon):
+    """상수 사전 계산 이전의 기상청 공식 (비교 기준)"""
+    RE, GRID, SLAT1, SLAT2, OLON, OLAT, XO, YO = 6371.00877, 5.0, 30.0, 60.0, 126.0, 38.0, 43, 136
+    DEGRAD = math.pi / 180.0
+    re = RE / GRID
+    slat1, slat2 = SLAT1 * DEGRAD, SLAT2 * DEGRAD
+    olon, olat = OLON * DEGRAD, OLAT * DEGRAD
+    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sf = math.pow(sf, sn) * math.cos(slat1) / sn
+    ro = math.tan(math.pi * 0.25 + olat * 0.5)
+    ro = re * sf / math.pow(ro, sn)
+    ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
+    ra = re * sf / math.pow(ra, sn)
+    theta = lon * DEGRAD - olon
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= sn
+    return int(ra * math.sin(theta) + XO + 0.5), int(ro - ra * math.cos(theta) + YO + 0.5)
+
+
+def test_known_locations():
+    """기상청 공개 격자 좌표와 일치"""
+    assert latlon_to_grid(37.5665, 126.9780) == (60, 127)  # 서울 시청
+    assert latlon_to_grid(35.1796, 129.0756) == (98, 76)   # 부산 시청
+
+
+def test_scalar_matches_reference():
+    rng = np.random.default_rng(0)
+    for lat, lon in zip(rng.uniform(32, 40, 2000), rng.uniform(124, 132, 2000)):
+        assert latlon_to_grid(lat, lon) == _reference_convert(lat, lon)
+
+
+def test_batch_matches_scalar():
+    """일괄 변환 결과가 스칼라 경로와 완전히 같음"""
+    rng = np.random.default_rng(1)
+    lats = rng.uniform(32, 40, 20000)
+    lons = rng.uniform(124, 132, 20000)
+
+    nx, ny = latlon_to_grid_batch(lats, lons)
+
+    expected = [latlon_to_grid(lat, lon) for lat, lon in zip(lats, lons)]
+    assert list(zip(nx.tolist(), ny.tolist())) == expected
+
+
+def test_batch_keeps_shape():
+    nx, ny = latlon_to_grid_batch([[37.5665, 35.1796]], [[126.9780, 129.0756]])
+    assert nx.shape == (1, 2)
+    assert nx.tolist() == [[60, 98]]
+    assert ny.tolist() == [[127, 76]]
+
+
+def test_lookup_table_matches_formula(tmp_path):
+    """조회 테이블 결과는 공식과 같고, 경계/영역 밖은 None (공식으로 대체)"""
+    from app.services.grid_lookup import build_lookup_table
+
+    table = build_lookup_table(
+        str(tmp_path / "grid.npy"),
+        lat_range=(37.0, 38.0),
+        lon_range=(126.5, 127.5),
+        step=0.001
+    )
+
+    rng = np.random.default_rng(2)
+    hits = 0
+    for lat, lon in zip(rng.uniform(37.0, 38.0, 5000), rng.uniform(126.5, 127.5, 5000)):
+        cell = table.lookup(lat, lon)
+        if cell is not None:
+            hits += 1
+            assert cell == latlon_to_grid(lat, lon)
+
+    assert hits > 4000
+    assert table.lookup(33.0, 126.5) is None
+
+    # 픽셀 경계 위 좌표와 영역 바로 밖(0행/0열로 잘려 읽히는) 좌표도 공식과 같음
+    edges = [37.0 + k * 0.001 for k in range(0, 1000, 7)]
+    for lat, lon in zip(edges, [126.5 + k * 0.001 for k in range(0, 1000, 7)]):
+        for point in ((lat, lon), (lat, 126.4995), (36.9995, lon - 0.0001)):
+            cell = table.lookup(*point)
+            assert cell is None or cell == latlon_to_grid(*point)
+
+
+def test_lookup_table_rejects_old_format(tmp_path):
+    """주변 픽셀 검사 없이 만든 예전 테이블은 로드하지 않음 (공식으로 대체)"""
+    import json
+
+    import pytest
+
+    from app.services.grid_lookup import GridLookupTable, build_lookup_table
+
+    path = str(tmp_path / "grid.npy")
+    build_lookup_table(path, lat_range=(37.0, 37.1), lon_range=(126.9, 127.0), step=0.001)
+    with open(f"{path}.json", "w", encoding="utf-8") as f:
+        json.dump({"lat_min": 37.0, "lon_min": 126.9, "step": 0.001}, f)
+
+    with pytest.raises(ValueError):
+        GridLookupTable.load(path)
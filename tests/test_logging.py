@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import sys
+
+from app.core.config import settings
+
+from app.core.logging import (
+    ContextFilter,
+    ErrorSampler,
+    JSONFormatter,
+    _QueueHandler,
+    grid_cell_var,
+    new_request_context,
+    record_timing,
+    set_grid_cell,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+def make_record(message="기상청 API 호출 실패: %s", args=("timeout",), level=logging.WARNING, lineno=10):
+    return logging.LogRecord("app.services.weather_service", level, "weather_service.py", lineno, message, args, None)
+
+
+def test_json_record_carries_request_context():
+    """요청 ID, 격자, 단계별 소요 시간, extra 필드를 한 줄 JSON으로 출력"""
+    new_request_context("req-1")
+    grid_cell_var.set("60,127")
+    record_timing("forecast_fetch", 0.0123)
+
+    record = make_record()
+    record.nx = 60
+    ContextFilter().filter(record)
+    line = JSONFormatter().format(_QueueHandler(None).prepare(record))
+    payload = json.loads(line)
+
+    assert payload["message"] == "기상청 API 호출 실패: timeout"
+    assert payload["request_id"] == "req-1"
+    assert payload["grid_cell"] == "60,127"
+    assert payload["timings"] == {"forecast_fetch": 12.3}
+    assert payload["nx"] == 60
+
+
+def test_exception_text_kept_separately():
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        record = make_record(level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+
+    payload = json.loads(JSONFormatter().format(_QueueHandler(None).prepare(record)))
+
+    assert payload["message"] == "기상청 API 호출 실패: timeout"
+    assert "ValueError: bad" in payload["exc_info"]
+
+
+def test_repeated_errors_sampled_per_call_site(monkeypatch):
+    """같은 위치의 경고는 윈도우당 burst건만 통과하고, 생략 건수를 다음 윈도우에 표시"""
+    clock = [0.0]
+    monkeypatch.setattr("app.core.logging.time.monotonic", lambda: clock[0])
+    sampler = ErrorSampler(window=60, burst=2)
+
+    passed = [sampler.filter(make_record()) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+
+    # 다른 위치와 INFO 레코드는 영향 없음
+    assert sampler.filter(make_record(lineno=20))
+    assert sampler.filter(make_record(level=logging.INFO))
+
+    clock[0] = 61.0
+    record = make_record()
+    assert sampler.filter(record)
+    assert record.suppressed == 3
+
+
+def test_grid_cell_set_in_child_task_reaches_request_context():
+    """요청이 띄운 하위 태스크에서 정한 격자가 요청 컨텍스트의 레코드에도 붙음"""
+    async def fetch_forecast(cell):
+        set_grid_cell(cell)
+
+    async def handle_request():
+        new_request_context("req-2")
+        await asyncio.ensure_future(fetch_forecast("98,76"))
+        await asyncio.ensure_future(fetch_forecast("60,127"))
+
+        record = make_record()
+        ContextFilter().filter(record)
+        return record
+
+    record = asyncio.run(handle_request())
+
+    assert record.request_id == "req-2"
+    assert record.grid_cell == "98,76"
+
+
+def test_access_log_written_after_stream_ends(caplog):
+    """스트리밍 응답의 접근 로그는 스트림이 끝난 뒤 전체 시간/단계와 함께 기록"""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from fastapi.testclient import TestClient
+
+    import main
+
+    app = FastAPI()
+    app.middleware("http")(main.request_context_middleware)
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            yield "data: first\n\n"
+            await asyncio.sleep(0.05)
+            record_timing("openai", 0.05)
+            yield "data: done\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    caplog.handler.addFilter(ContextFilter())
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        response = TestClient(app).get("/stream")
+
+    assert response.text.endswith("data: done\n\n")
+    records = [record for record in caplog.records if record.name == "app.access"]
+    assert len(records) == 1
+    assert records[0].duration_ms >= 50
+    assert records[0].timings == {"openai": 50.0}
+    assert records[0].request_id == response.headers["X-Request-ID"]
+
+
+def test_records_after_shutdown_written_directly(monkeypatch, capsys):
+    """종료 뒤 로그도 버리지 않고 출력 핸들러로 바로 기록"""
+    monkeypatch.setattr(settings, "LOG_JSON", True)
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    try:
+        setup_logging()
+        logging.getLogger("app.test").warning("종료 전")
+        shutdown_logging()
+        new_request_context("req-shutdown")
+        logging.getLogger("app.test").warning("종료 후")
+
+        assert not any(isinstance(h, _QueueHandler) for h in root.handlers)
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line["message"] for line in lines] == ["종료 전", "종료 후"]
+        assert lines[1]["request_id"] == "req-shutdown"
+    finally:
+        root.handlers, root.level = saved
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.popularity import PopularityTracker
+from app.services.prewarm import ForecastPrewarmer
+from app.services.weather_service import get_next_base_datetime
+
+
+class FakeWeatherService:
+    """warm_forecast 호출을 기록하고 지정한 격자에서만 실패하는 대역"""
+
+    def __init__(self, cells, failing=()):
+        self.popularity = PopularityTracker(maxsize=100, half_life=3600)
+        for cell in cells:
+            self.popularity.record(cell)
+        self.failing = set(failing)
+        self.warmed = []
+        self.slots = set()
+
+    async def warm_forecast(self, nx, ny, slot=None):
+        if (nx, ny) in self.failing:
+            raise RuntimeError("upstream down")
+        self.warmed.append((nx, ny))
+        self.slots.add(slot)
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(settings, "KMA_PUBLISH_DELAY_SECONDS", 600.0)
+    monkeypatch.setattr(settings, "PREWARM_ENABLED", True)
+    monkeypatch.setattr(settings, "PREWARM_LEAD_SECONDS", 300.0)
+    monkeypatch.setattr(settings, "PREWARM_JITTER_SECONDS", 0.0)
+
+
+@pytest.mark.parametrize("now, expected", [
+    # 발표분 제공(발표 + 10분) 전이면 같은 발표분을 기다림
+    (datetime(2024, 3, 1, 11, 5), datetime(2024, 3, 1, 11, 10)),
+    # 제공 후 슬롯 전환(+15분) 전이면 바로 시작
+    (datetime(2024, 3, 1, 11, 12), datetime(2024, 3, 1, 11, 12)),
+    # 전환이 이미 지났으면 다음 발표분
+    (datetime(2024, 3, 1, 11, 15), datetime(2024, 3, 1, 14, 10)),
+    (datetime(2024, 3, 1, 12, 30), datetime(2024, 3, 1, 14, 10)),
+    # 자정 전후 rollover (2300 발표분 이후 → 다음날 0200 발표분)
+    (datetime(2024, 3, 1, 23, 30), datetime(2024, 3, 2, 2, 10)),
+    (datetime(2024, 3, 2, 1, 30), datetime(2024, 3, 2, 2, 10)),
+    (datetime(2024, 2, 29, 23, 5), datetime(2024, 2, 29, 23, 10)),
+])
+def test_seconds_until_next_cycle(no_jitter, now, expected):
+    prewarmer = ForecastPrewarmer(FakeWeatherService([]))
+
+    assert prewarmer._seconds_until_next_cycle(now) == (expected - now).total_seconds()
+
+
+def test_seconds_until_next_cycle_finishes_jitter_before_switch(no_jitter, monkeypatch):
+    """지터를 더해도 프리워밍은 요청 경로의 슬롯 전환(14:15)보다 먼저 시작"""
+    monkeypatch.setattr(settings, "PREWARM_JITTER_SECONDS", 60.0)
+    prewarmer = ForecastPrewarmer(FakeWeatherService([]))
+    now = datetime(2024, 3, 1, 12, 0)
+    switch_at = get_next_base_datetime(now)
+
+    assert switch_at == datetime(2024, 3, 1, 14, 15)
+    for _ in range(20):
+        seconds = prewarmer._seconds_until_next_cycle(now)
+        assert 2 * 3600 + 600 <= seconds <= 2 * 3600 + 660
+        assert seconds < (switch_at - now).total_seconds()
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_counts_success_and_failure(monkeypatch):
+    """인기 격자 상위 N개만 채우고, 실패 격자는 세어서 메트릭에 반영"""
+    monkeypatch.setattr(settings, "PREWARM_TOP_N", 3)
+    cells = [(60, 127)] * 4 + [(98, 76)] * 3 + [(55, 124)] * 2 + [(1, 1)]
+    service = FakeWeatherService(cells, failing={(98, 76)})
+    prewarmer = ForecastPrewarmer(service)
+
+    before = {
+        name: metrics.counter(name).value
+        for name in ("prewarm.cycles", "prewarm.cells_warmed", "prewarm.cells_failed")
+    }
+    observed = metrics.histogram("prewarm.cycle_seconds").count
+
+    assert await prewarmer.run_cycle() == (2, 1)
+
+    assert sorted(service.warmed) == [(55, 124), (60, 127)]
+    assert metrics.counter("prewarm.cycles").value == before["prewarm.cycles"] + 1
+    assert metrics.counter("prewarm.cells_warmed").value == before["prewarm.cells_warmed"] + 2
+    assert metrics.counter("prewarm.cells_failed").value == before["prewarm.cells_failed"] + 1
+    assert metrics.histogram("prewarm.cycle_seconds").count == observed + 1
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_without_popular_cells():
+    prewarmer = ForecastPrewarmer(FakeWeatherService([]))
+
+    assert await prewarmer.run_cycle() == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_warms_given_slot():
+    """주기 작업은 전환 전에 다음 슬롯을 넘겨서 채움"""
+    service = FakeWeatherService([(60, 127)])
+    prewarmer = ForecastPrewarmer(service)
+
+    assert await prewarmer.run_cycle(("20240301", "1400")) == (1, 0)
+
+    assert service.slots == {("20240301", "1400")}
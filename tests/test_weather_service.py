@@ -0,0 +1,238 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.services.weather_service import WeatherService, get_base_datetime
+
+
+CATEGORIES = {
+    "TMP": "15", "UUU": "1.2", "VVV": "-0.5", "VEC": "250", "WSD": "2.1", "SKY": "1",
+    "PTY": "0", "POP": "20", "WAV": "0", "PCP": "강수없음", "REH": "55", "SNO": "적설없음",
+}
+
+
+def make_items(hours: int = 6):
+    """현재 시각부터 hours 시간치 기상청 예보 항목 생성 (시간마다 기온 +1도)"""
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+    items = []
+    for offset in range(hours):
+        when = start + timedelta(hours=offset)
+        for category, value in CATEGORIES.items():
+            if category == "TMP":
+                value = str(10 + offset)
+            items.append({
+                "category": category,
+                "fcstDate": when.strftime("%Y%m%d"),
+                "fcstTime": when.strftime("%H00"),
+                "fcstValue": value,
+            })
+    return items
+
+
+def kma_handler(items, calls):
+    """페이지 단위로 응답하는 기상청 API 대역"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        page = int(request.url.params["pageNo"])
+        rows = int(request.url.params["numOfRows"])
+        page_items = items[(page - 1) * rows:page * rows]
+        return httpx.Response(200, json={
+            "response": {
+                "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+                "body": {
+                    "dataType": "JSON",
+                    "items": {"item": page_items},
+                    "pageNo": page,
+                    "numOfRows": rows,
+                    "totalCount": len(items),
+                },
+            }
+        })
+    return handler
+
+
+def make_service(monkeypatch, items, calls, rows=1000):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "KMA_NUM_OF_ROWS", rows)
+    service = WeatherService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(kma_handler(items, calls)))
+    return service
+
+
+@pytest.mark.asyncio
+async def test_full_forecast_fetched_once_per_slot(monkeypatch):
+    """슬롯당 한 번만 호출하고 이후 시각도 캐시에서 조회"""
+    calls = []
+    service = make_service(monkeypatch, make_items(hours=6), calls, rows=24)
+
+    now = await service.get_weather_forecast(37.5665, 126.9780)
+    later = await service.get_weather_forecast(
+        37.5665, 126.9780, target_time=datetime.now() + timedelta(hours=3)
+    )
+
+    # 72개 항목 / 페이지당 24개 = 3페이지, 두 번째 조회는 캐시 사용
+    assert len(calls) == 3
+    assert {request.url.params["pageNo"] for request in calls} == {"1", "2", "3"}
+    params = calls[0].url.params
+    assert (params["base_date"], params["base_time"]) == get_base_datetime()
+    assert now["temperature"] == 10.0
+    assert later["temperature"] == 13.0
+    assert now["sky_condition"] == "맑음"
+    assert now["rain_type"] == "없음"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch(monkeypatch):
+    """같은 격자 동시 요청은 기상청 호출 한 번으로 합쳐짐"""
+    calls = []
+    service = make_service(monkeypatch, make_items(hours=3), calls)
+
+    results = await asyncio.gather(
+        *(service.get_weather_forecast(37.5665, 126.9780) for _ in range(20))
+    )
+
+    assert len(calls) == 1
+    assert all(result["temperature"] == 10.0 for result in results)
+
+
+def test_decoder_rejects_xml_error_body():
+    """dataType=JSON이어도 오는 XML 에러 본문은 전체 파싱 전에 거름"""
+    from app.core.exceptions import WeatherAPIError
+    from app.services.kma_decoder import decode_forecast_page
+
+    body = (
+        b"<OpenAPI_ServiceResponse><cmmMsgHeader>"
+        b"<returnAuthMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR</returnAuthMsg>"
+        b"<returnReasonCode>30</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+    )
+    with pytest.raises(WeatherAPIError, match="30"):
+        decode_forecast_page(body, "text/xml;charset=UTF-8")
+
+
+def test_decoder_rejects_error_result_code():
+    from app.core.exceptions import WeatherAPIError
+    from app.services.kma_decoder import decode_forecast_page
+
+    body = b'{"response":{"header":{"resultCode":"03","resultMsg":"NO_DATA"}}}'
+    with pytest.raises(WeatherAPIError, match="NO_DATA"):
+        decode_forecast_page(body, "application/json")
+
+
+def test_forecast_columns_align_unordered_items():
+    """순서가 섞인 항목도 예보 시각별 컬럼으로 정렬"""
+    from app.services.kma_decoder import ForecastColumns
+
+    columns = ForecastColumns()
+    columns.add([
+        {"fcstDate": "20240301", "fcstTime": "0700", "category": "TMP", "fcstValue": "8"},
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "SKY", "fcstValue": "1"},
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "TMP", "fcstValue": "7"},
+    ])
+    columns.finalize()
+
+    assert columns.times == [("20240301", "0600"), ("20240301", "0700")]
+    assert columns.columns["TMP"] == ["7", "8"]
+    assert columns.columns["SKY"] == ["1", None]
+
+
+def test_forecast_typed_arrays_round_trip():
+    """타입 배열 시계열 → weather_info 변환시 원래 값 유지"""
+    from app.services.forecast import Forecast
+    from app.services.kma_decoder import ForecastColumns
+
+    columns = ForecastColumns()
+    columns.add([
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "TMP", "fcstValue": "-3.7"},
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "WSD", "fcstValue": "4.3"},
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "POP", "fcstValue": "60"},
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "SKY", "fcstValue": "4"},
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "PTY", "fcstValue": "3"},
+        {"fcstDate": "20240301", "fcstTime": "0600", "category": "PCP", "fcstValue": "1.0mm"},
+        {"fcstDate": "20240301", "fcstTime": "0700", "category": "TMP", "fcstValue": "-2.1"},
+    ])
+    forecast = Forecast.from_columns(columns)
+
+    assert forecast.to_weather_info(0) == {
+        "temperature": -3.7,
+        "precipitation": "1.0mm",
+        "rain_probability": 60,
+        "humidity": None,
+        "sky_condition": "흐림",
+        "rain_type": "눈",
+        "wind_speed": 4.3,
+    }
+    assert forecast.times.typecode == "I"
+    assert forecast.times.tolist() == [2024030106, 2024030107]
+    assert forecast.index_at(datetime(2024, 3, 1, 5, 0)) == 0
+    assert forecast.index_at(datetime(2024, 3, 1, 6, 40)) == 0
+    assert forecast.index_at(datetime(2024, 3, 1, 7, 5)) == 1
+    assert forecast.to_weather_info(1)["rain_type"] is None
+
+
+@pytest.mark.asyncio
+async def test_stale_forecast_served_when_upstream_fails(monkeypatch):
+    """기상청 실패시 더미 대신 직전 예보를 stale로 응답"""
+    from app.core.config import settings
+
+    calls = []
+    service = make_service(monkeypatch, make_items(hours=3), calls)
+    fresh = await service.get_weather_forecast(37.5665, 126.9780)
+    assert fresh["stale"] is False
+    assert fresh["fallback"] is False
+
+    # 다음 슬롯으로 넘어간 상황: 현재 슬롯 캐시가 비고 기상청은 응답 지연
+    service._forecast_cache.clear()
+
+    async def slow_handler(request):
+        await asyncio.sleep(0.5)
+        return httpx.Response(503)
+
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+    monkeypatch.setattr(settings, "FORECAST_LATENCY_BUDGET_SECONDS", 0.05)
+
+    stale = await service.get_weather_forecast(37.5665, 126.9780)
+
+    assert stale["stale"] is True
+    assert stale["fallback"] is False
+    assert stale["temperature"] == fresh["temperature"]
+
+
+@pytest.mark.asyncio
+async def test_dummy_forecast_marked_as_fallback():
+    """직전 예보도 없이 기상청이 실패하면 기본값을 fallback으로 표시"""
+    service = WeatherService()
+    service._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(503))
+    )
+
+    result = await service.get_weather_forecast(37.5665, 126.9780)
+
+    assert result["fallback"] is True
+    assert result["stale"] is True
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reused_and_closed(monkeypatch):
+    """설정대로 만든 공용 클라이언트 하나를 모든 기상청 호출에 재사용하고 종료시 닫음"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "KMA_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(settings, "KMA_CONNECT_TIMEOUT", 1.5)
+    service = WeatherService()
+    await service.start()
+    client = service._client
+
+    assert client.timeout.connect == 1.5
+    assert client.timeout.read == settings.KMA_READ_TIMEOUT
+    assert client._transport._pool._max_connections == 7
+
+    # start() 재호출이나 지연 생성 경로도 같은 클라이언트를 반환
+    await service.start()
+    assert service._get_client() is client
+
+    await service.close()
+    assert client.is_closed
+    assert service._client is None